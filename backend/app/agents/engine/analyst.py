@@ -9,7 +9,7 @@ The Analyst agent is responsible for:
 - Business intelligence
 """
 
-from typing import List, Dict, Any, AsyncIterator, Optional
+from typing import List, Dict, Any, AsyncIterator, Optional, ClassVar, FrozenSet
 import logging
 from datetime import datetime
 from enum import Enum
@@ -83,14 +83,14 @@ class AnalystAgent(BaseAgent):
     - Data-driven recommendations
     """
     
+    CAPABILITIES: ClassVar[FrozenSet[AgentCapability]] = frozenset({
+        AgentCapability.ANALYSIS,
+        AgentCapability.PLANNING,
+        AgentCapability.RESEARCH
+    })
+    
     def _initialize(self) -> None:
         """Initialize analyst-specific components."""
-        self.capabilities = [
-            AgentCapability.ANALYSIS,
-            AgentCapability.PLANNING,
-            AgentCapability.RESEARCH
-        ]
-        
         # Analysis cache
         self.analysis_cache: Dict[str, Any] = {}
         
@@ -592,4 +592,8 @@ When analyzing:
         else:
             result.recommendations.append("Gather more data to increase confidence")
         
-        return result
\ No newline at end of file
+        return result
+
+
+# Agent class picked up by AgentRegistry.auto_discover
+AGENT_CLASS = AnalystAgent
@@ -6,11 +6,14 @@ defining the core interface and common functionality.
 """
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional, AsyncIterator, Callable
+from typing import Any, Dict, List, Optional, AsyncIterator, Callable, ClassVar, FrozenSet
 from enum import Enum
 from datetime import datetime
+from functools import cached_property, lru_cache
+import time
 import uuid
 import logging
+import orjson
 from pydantic import BaseModel, Field
 
 from langchain_core.messages import BaseMessage, HumanMessage, AIMessage, SystemMessage
@@ -22,6 +25,34 @@ from langgraph.checkpoint.base import BaseCheckpointSaver
 logger = logging.getLogger(__name__)
 
 
+def _json_default(obj: Any) -> Any:
+    """Fallback for values orjson cannot serialize natively."""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    return str(obj)
+
+
+def dumps_json(value: Any) -> bytes:
+    """Serialize a value to JSON bytes with orjson."""
+    return orjson.dumps(value, default=_json_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+def cached_text_block(text: str) -> Dict[str, Any]:
+    """Content block marking a prompt prefix as cacheable for Anthropic models."""
+    return {"type": "text", "text": text, "cache_control": {"type": "ephemeral"}}
+
+
+@lru_cache(maxsize=1)
+def _format_utc_second(second: int) -> str:
+    """Format a Unix second as an ISO 8601 UTC timestamp."""
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(second))
+
+
+def utc_now_iso() -> str:
+    """Current UTC time as an ISO 8601 string, formatted at most once per second."""
+    return _format_utc_second(time.time_ns() // 1_000_000_000)
+
+
 class AgentStatus(str, Enum):
     """Agent execution status."""
     IDLE = "idle"
@@ -103,6 +134,9 @@ class BaseAgent(ABC):
     - Streaming progress updates
     """
     
+    # Capabilities declared at class level so they can be read without instantiating
+    CAPABILITIES: ClassVar[Optional[FrozenSet[AgentCapability]]] = None
+    
     def __init__(
         self,
         agent_id: str,
@@ -123,7 +157,8 @@ class BaseAgent(ABC):
             description: Agent's purpose and capabilities
             llm: Language model to use
             tools: Available tools for the agent
-            capabilities: List of agent capabilities
+            capabilities: List of agent capabilities, used only when the class
+                declares no ``CAPABILITIES``
             checkpoint_saver: For saving/restoring state
             **kwargs: Additional agent-specific configuration
         """
@@ -132,7 +167,9 @@ class BaseAgent(ABC):
         self.description = description
         self.llm = llm
         self.tools = tools or []
-        self.capabilities = capabilities or []
+        if capabilities is not None and self.CAPABILITIES is None:
+            # Class-level CAPABILITIES win, matching what the registry indexes
+            self.capabilities = frozenset(AgentCapability(cap) for cap in capabilities)
         self.checkpoint_saver = checkpoint_saver
         self.config = kwargs
         
@@ -253,8 +290,18 @@ Current context:
         
         return messages
     
-    def _create_event(self, event_type: str, data: Dict[str, Any]) -> AgentEvent:
-        """Create an agent event."""
+    def _create_event(
+        self,
+        event_type: str,
+        data: Dict[str, Any]
+    ) -> AgentEvent:
+        """
+        Create an agent event.
+        
+        Args:
+            event_type: Event type
+            data: Event data
+        """
         event = AgentEvent(
             type=event_type,
             agent_id=self.agent_id,
@@ -297,7 +344,12 @@ Current context:
             # This will be implemented by specific agents that support approval
             logger.info(f"Action {action_id} {'approved' if approved else 'rejected'}")
     
-    def get_capabilities(self) -> List[AgentCapability]:
+    @cached_property
+    def capabilities(self) -> FrozenSet[AgentCapability]:
+        """Agent capabilities, defaulting to the class-level declaration."""
+        return self.CAPABILITIES or frozenset()
+    
+    def get_capabilities(self) -> FrozenSet[AgentCapability]:
         """Get agent capabilities."""
         return self.capabilities
     
@@ -305,6 +357,10 @@ Current context:
         """Check if agent has a specific capability."""
         return capability in self.capabilities
     
+    def supports_prompt_caching(self, llm: Optional[BaseLLM] = None) -> bool:
+        """Check if the LLM (the agent's own by default) honours cache_control markers on prompt content blocks."""
+        return getattr(llm or self.llm, "_llm_type", "") == "anthropic-chat"
+    
     def get_status(self) -> AgentStatus:
         """Get current agent status."""
         return self.status
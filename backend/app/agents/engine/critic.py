@@ -10,7 +10,7 @@ The Critic agent is responsible for:
 - Risk assessment
 """
 
-from typing import List, Dict, Any, AsyncIterator, Optional
+from typing import List, Dict, Any, AsyncIterator, Optional, ClassVar, FrozenSet
 import logging
 from datetime import datetime
 from enum import Enum
@@ -105,14 +105,14 @@ class CriticAgent(BaseAgent):
     - Constructive feedback
     """
     
+    CAPABILITIES: ClassVar[FrozenSet[AgentCapability]] = frozenset({
+        AgentCapability.REVIEW,
+        AgentCapability.ANALYSIS,
+        AgentCapability.PLANNING
+    })
+    
     def _initialize(self) -> None:
         """Initialize critic-specific components."""
-        self.capabilities = [
-            AgentCapability.REVIEW,
-            AgentCapability.ANALYSIS,
-            AgentCapability.PLANNING
-        ]
-        
         # Review history cache
         self.review_history: List[Dict[str, Any]] = []
         
@@ -630,4 +630,8 @@ When reviewing:
         else:
             result.recommendations.insert(0, "Work meets quality standards")
         
-        return result
\ No newline at end of file
+        return result
+
+
+# Agent class picked up by AgentRegistry.auto_discover
+AGENT_CLASS = CriticAgent
@@ -9,7 +9,7 @@ The Engineer agent is responsible for:
 - API integration
 """
 
-from typing import List, Dict, Any, AsyncIterator, Optional
+from typing import List, Dict, Any, AsyncIterator, Optional, ClassVar, FrozenSet
 import logging
 from datetime import datetime
 from enum import Enum
@@ -83,15 +83,15 @@ class EngineerAgent(BaseAgent):
     - Technical documentation
     """
     
+    CAPABILITIES: ClassVar[FrozenSet[AgentCapability]] = frozenset({
+        AgentCapability.CODING,
+        AgentCapability.ANALYSIS,
+        AgentCapability.REVIEW,
+        AgentCapability.INTEGRATION
+    })
+    
     def _initialize(self) -> None:
         """Initialize engineer-specific components."""
-        self.capabilities = [
-            AgentCapability.CODING,
-            AgentCapability.ANALYSIS,
-            AgentCapability.REVIEW,
-            AgentCapability.INTEGRATION
-        ]
-        
         # Code patterns and best practices cache
         self.patterns_cache: Dict[str, Any] = {}
         
@@ -567,4 +567,8 @@ Include:
         elif line_count < 100:
             return "medium"
         else:
-            return "high"
\ No newline at end of file
+            return "high"
+
+
+# Agent class picked up by AgentRegistry.auto_discover
+AGENT_CLASS = EngineerAgent
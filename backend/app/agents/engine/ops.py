@@ -9,7 +9,7 @@ The Ops agent is responsible for:
 - Incident response
 """
 
-from typing import List, Dict, Any, AsyncIterator, Optional
+from typing import List, Dict, Any, AsyncIterator, Optional, ClassVar, FrozenSet
 import logging
 from datetime import datetime
 from enum import Enum
@@ -83,14 +83,14 @@ class OpsAgent(BaseAgent):
     - Infrastructure as Code
     """
     
+    CAPABILITIES: ClassVar[FrozenSet[AgentCapability]] = frozenset({
+        AgentCapability.OPERATIONS,
+        AgentCapability.ANALYSIS,
+        AgentCapability.INTEGRATION
+    })
+    
     def _initialize(self) -> None:
         """Initialize ops-specific components."""
-        self.capabilities = [
-            AgentCapability.OPERATIONS,
-            AgentCapability.ANALYSIS,
-            AgentCapability.INTEGRATION
-        ]
-        
         # System state cache
         self.system_state: Dict[str, Any] = {}
         
@@ -535,4 +535,8 @@ When performing operations:
             "success": True,
             "checks_passed": ["service_health", "connectivity", "performance"],
             "timestamp": datetime.utcnow().isoformat()
-        }
\ No newline at end of file
+        }
+
+
+# Agent class picked up by AgentRegistry.auto_discover
+AGENT_CLASS = OpsAgent
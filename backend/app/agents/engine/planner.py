@@ -8,18 +8,21 @@ The Planner agent is responsible for:
 - Managing task priorities and sequences
 """
 
-from typing import List, Dict, Any, AsyncIterator, Optional
+from typing import List, Dict, Any, AsyncIterator, Optional, Tuple, ClassVar, FrozenSet
+import heapq
 import json
 import logging
-from datetime import datetime
+import re
+import time
 
 from langchain_core.messages import BaseMessage, HumanMessage, AIMessage
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import JsonOutputParser
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ValidationError
+import orjson
 
 from app.agents.engine.base import (
-    BaseAgent, AgentEvent, AgentRequest, AgentCapability, AgentStatus
+    BaseAgent, AgentEvent, AgentRequest, AgentCapability, AgentStatus, utc_now_iso
 )
 
 logger = logging.getLogger(__name__)
@@ -45,35 +48,20 @@ class ExecutionPlan(BaseModel):
     tasks: List[TaskNode] = Field(..., description="List of tasks to execute")
     estimated_total_duration: int = Field(..., description="Total estimated duration in seconds")
     parallel_execution: bool = Field(default=True, description="Whether tasks can run in parallel")
-    created_at: str = Field(default_factory=lambda: datetime.utcnow().isoformat())
+    created_at: str = Field(default_factory=utc_now_iso)
 
 
-class PlannerAgent(BaseAgent):
-    """
-    Planner Agent - The strategic orchestrator of the Syna system.
-    
-    Specializes in:
-    - Task decomposition and planning
-    - Multi-agent coordination
-    - Workflow optimization
-    - Strategic decision making
-    """
-    
-    def _initialize(self) -> None:
-        """Initialize planner-specific components."""
-        self.capabilities = [
-            AgentCapability.PLANNING,
-            AgentCapability.ANALYSIS,
-            AgentCapability.SCHEDULING
-        ]
-        
-        # Parser for structured output
-        self.plan_parser = JsonOutputParser(pydantic_object=ExecutionPlan)
-    
-    def _create_prompt(self) -> ChatPromptTemplate:
-        """Create the planner's prompt template."""
-        return ChatPromptTemplate.from_messages([
-            ("system", """You are the Planner Agent, responsible for breaking down complex requests into actionable tasks.
+# Shared across planner instances; ExecutionPlan and the prompt are fixed
+_PLAN_PARSER = JsonOutputParser(pydantic_object=ExecutionPlan)
+
+# Schema is baked into the prompt; braces are doubled for the template
+_PLAN_SCHEMA_JSON = (
+    orjson.dumps(ExecutionPlan.model_json_schema()).decode()
+    .replace("{", "{{").replace("}", "}}")
+)
+
+_PLAN_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", """You are the Planner Agent, responsible for breaking down complex requests into actionable tasks.
 
 Your role is to:
 1. Analyze the user's request and understand the goal
@@ -98,10 +86,133 @@ When creating a plan, consider:
 - Which tasks might need approval before execution
 - Realistic time estimates for each task
 
-{format_instructions}"""),
-            ("human", "{query}"),
-            ("system", "Create a comprehensive execution plan for this request.")
-        ])
+Respond with a single JSON object, without surrounding prose or code fences,
+that conforms to this JSON schema:
+""" + _PLAN_SCHEMA_JSON),
+    ("human", "{query}"),
+    ("system", "Create a comprehensive execution plan for this request.")
+])
+
+
+_JSON_DECODER = json.JSONDecoder()
+
+
+_TASKS_ARRAY_RE = re.compile(r'"tasks"\s*:\s*\[')
+
+
+class _StreamedTaskScanner:
+    """
+    Incrementally decode the entries of a streamed plan's "tasks" array.
+    
+    Scanning resumes after the last decoded task, so each closed task is
+    decoded once and total work stays linear in the length of the output.
+    """
+    
+    def __init__(self):
+        self._buffer = ""
+        self._pos: Optional[int] = None
+        self._done = False
+    
+    def feed(self, text: str) -> List[Any]:
+        """
+        Add streamed text and decode any task objects it completed.
+        
+        Args:
+            text: Next chunk of LLM output
+            
+        Returns:
+            Newly closed task objects, in order
+        """
+        search_from = max(len(self._buffer) - 16, 0)
+        self._buffer += text
+        if self._done:
+            return []
+        
+        if self._pos is None:
+            match = _TASKS_ARRAY_RE.search(self._buffer, search_from)
+            if match is None:
+                return []
+            self._pos = match.end()
+        elif "}" not in text:
+            return []
+        
+        buffer = self._buffer
+        pos = self._pos
+        found = []
+        while True:
+            while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                pos += 1
+            if pos >= len(buffer):
+                break
+            if buffer[pos] != "{":
+                # End of the array, or output we cannot follow
+                self._done = True
+                break
+            try:
+                obj, pos_end = _JSON_DECODER.raw_decode(buffer, pos)
+            except ValueError:
+                break  # Task still open; retry from here on the next "}"
+            found.append(obj)
+            pos = pos_end
+        
+        self._pos = pos
+        return found
+
+
+def _extract_json_objects(text: str) -> List[Dict[str, Any]]:
+    """
+    Extract the JSON objects embedded in free-form text.
+    
+    Args:
+        text: Text that may contain JSON objects
+        
+    Returns:
+        Decoded objects ordered from the longest to the shortest source span
+    """
+    found = []
+    start = text.find("{")
+    while start != -1:
+        try:
+            obj, end = _JSON_DECODER.raw_decode(text, start)
+        except ValueError:
+            start = text.find("{", start + 1)
+            continue
+        if isinstance(obj, dict):
+            found.append((end - start, obj))
+        start = text.find("{", end)
+    
+    found.sort(key=lambda item: item[0], reverse=True)
+    return [obj for _, obj in found]
+
+
+class PlannerAgent(BaseAgent):
+    """
+    Planner Agent - The strategic orchestrator of the Syna system.
+    
+    Specializes in:
+    - Task decomposition and planning
+    - Multi-agent coordination
+    - Workflow optimization
+    - Strategic decision making
+    """
+    
+    CAPABILITIES: ClassVar[FrozenSet[AgentCapability]] = frozenset({
+        AgentCapability.PLANNING,
+        AgentCapability.ANALYSIS,
+        AgentCapability.SCHEDULING
+    })
+    
+    def _initialize(self) -> None:
+        """Initialize planner-specific components."""
+        # Parser for structured output
+        self.plan_parser = _PLAN_PARSER
+        
+        # The prompt never changes between requests
+        self._prompt = self._create_prompt()
+    
+    def _create_prompt(self) -> ChatPromptTemplate:
+        """Create the planner's prompt template."""
+        return _PLAN_PROMPT
     
     async def _execute_core(
         self,
@@ -125,51 +236,86 @@ When creating a plan, consider:
                 "message": "Analyzing request and creating execution plan..."
             })
             
-            # Create the prompt
-            prompt = self._create_prompt()
-            format_instructions = self.plan_parser.get_format_instructions()
+            # Format the cached prompt with the query
+            formatted_prompt = self._prompt.format_messages(query=request.query)
             
-            # Format the prompt with the query
-            formatted_prompt = prompt.format_messages(
-                query=request.query,
-                format_instructions=format_instructions
-            )
-            
-            # Generate the plan
-            response = await self.llm.ainvoke(formatted_prompt)
+            # Generate the plan, announcing tasks as soon as the LLM closes them
+            announced: Dict[str, Dict[str, Any]] = {}
+            if request.stream:
+                chunks = []
+                scanner = _StreamedTaskScanner()
+                async for chunk in self.llm.astream(formatted_prompt):
+                    text = getattr(chunk, "content", chunk)
+                    if not isinstance(text, str):
+                        continue
+                    chunks.append(text)
+                    
+                    # Announce only tasks that validate and carry a new id
+                    for raw_task in scanner.feed(text):
+                        try:
+                            task = TaskNode.model_validate(raw_task).model_dump(mode="json")
+                        except ValidationError:
+                            continue
+                        if task["id"] not in announced:
+                            announced[task["id"]] = task
+                            yield self._create_event("task_planned", {"task": task})
+                content = "".join(chunks)
+            else:
+                response = await self.llm.ainvoke(formatted_prompt)
+                content = response.content
             
-            # Parse the response
-            try:
-                plan = self.plan_parser.parse(response.content)
-            except Exception as parse_error:
+            # Parse the response, salvaging JSON embedded in prose if needed
+            plan = self._parse_plan(content)
+            if plan is None:
                 # Fallback to creating a simple plan
-                logger.warning(f"Failed to parse structured plan: {parse_error}")
-                plan = self._create_fallback_plan(request.query, response.content)
+                logger.warning("Failed to parse structured plan")
+                plan = self._create_fallback_plan(request.query, content)
             
             # Validate and optimize the plan
             plan = self._optimize_plan(plan)
             
+            # Serialize the plan once; every event below reads from this dump
+            plan_data = plan.model_dump(mode="json") if isinstance(plan, ExecutionPlan) else plan
+            
+            task_list = plan_data.get("tasks", [])
+            
+            # Withdraw announced tasks the final plan dropped or changed
+            if announced:
+                final_tasks = {
+                    task.get("id"): task for task in task_list if isinstance(task, dict)
+                }
+                retracted = [
+                    task_id for task_id, task in announced.items()
+                    if final_tasks.get(task_id) != task
+                ]
+                if retracted:
+                    for task_id in retracted:
+                        del announced[task_id]
+                    yield self._create_event("tasks_retracted", {"task_ids": retracted})
+            
             # Emit the plan
             yield self._create_event("plan_created", {
-                "plan": plan.dict() if isinstance(plan, ExecutionPlan) else plan
+                "plan": plan_data
             })
             
-            # If streaming, emit task details
+            # If streaming, emit details of tasks not already announced mid-stream
             if request.stream:
-                for task in plan.tasks if isinstance(plan, ExecutionPlan) else plan.get("tasks", []):
+                for task in task_list:
+                    if isinstance(task, dict) and task.get("id") in announced:
+                        continue
                     yield self._create_event("task_planned", {
-                        "task": task.dict() if hasattr(task, 'dict') else task
+                        "task": task
                     })
             
             # Store plan in context for other agents
             if request.context:
-                request.context.metadata["execution_plan"] = plan.dict() if isinstance(plan, ExecutionPlan) else plan
+                request.context.metadata["execution_plan"] = plan_data
             
             # Emit completion
             yield self._create_event("planning_complete", {
-                "total_tasks": len(plan.tasks) if isinstance(plan, ExecutionPlan) else len(plan.get("tasks", [])),
-                "estimated_duration": plan.estimated_total_duration if isinstance(plan, ExecutionPlan) else 0,
-                "plan_id": plan.id if isinstance(plan, ExecutionPlan) else plan.get("id", "unknown")
+                "total_tasks": len(task_list),
+                "estimated_duration": plan_data.get("estimated_total_duration", 0),
+                "plan_id": plan_data.get("id", "unknown")
             })
             
         except Exception as e:
@@ -179,6 +325,35 @@ When creating a plan, consider:
             })
             raise
     
+    def _parse_plan(self, text: str) -> Optional[Any]:
+        """
+        Parse an execution plan from the LLM response.
+        
+        Tries the structured parser first, then every JSON object embedded
+        in the text, longest first.
+        
+        Args:
+            text: Raw LLM response
+            
+        Returns:
+            A validated ExecutionPlan, the first parsed plan dictionary if none
+            validates, or None if no JSON object could be parsed
+        """
+        candidates = []
+        try:
+            candidates.append(self.plan_parser.parse(text))
+        except Exception as parse_error:
+            logger.debug(f"Structured plan parsing failed: {parse_error}")
+        candidates.extend(_extract_json_objects(text))
+        
+        for candidate in candidates:
+            try:
+                return ExecutionPlan.model_validate(candidate)
+            except ValidationError:
+                continue
+        
+        return next((c for c in candidates if isinstance(c, dict)), None)
+    
     def _create_fallback_plan(self, query: str, llm_response: str) -> Dict[str, Any]:
         """
         Create a simple fallback plan when structured parsing fails.
@@ -191,7 +366,7 @@ When creating a plan, consider:
             Simple plan dictionary
         """
         return {
-            "id": f"plan_{datetime.utcnow().timestamp()}",
+            "id": f"plan_{time.time_ns()}",
             "goal": query,
             "tasks": [
                 {
@@ -208,7 +383,7 @@ When creating a plan, consider:
             ],
             "estimated_total_duration": 120,
             "parallel_execution": False,
-            "created_at": datetime.utcnow().isoformat()
+            "created_at": utc_now_iso()
         }
     
     def _optimize_plan(self, plan: Any) -> Any:
@@ -224,17 +399,14 @@ When creating a plan, consider:
         if not isinstance(plan, ExecutionPlan):
             return plan
         
-        # Sort tasks by priority and dependencies
-        sorted_tasks = self._topological_sort(plan.tasks)
+        # Sort tasks, detect parallelism and find the critical path in one pass
+        sorted_tasks, parallelizable, critical_path = self._analyze_plan(plan.tasks)
         plan.tasks = sorted_tasks
-        
-        # Identify parallel execution opportunities
-        plan.parallel_execution = self._can_parallelize(plan.tasks)
+        plan.parallel_execution = parallelizable
         
         # Update total duration estimate
         if plan.parallel_execution:
-            # Calculate critical path duration
-            plan.estimated_total_duration = self._calculate_critical_path_duration(plan.tasks)
+            plan.estimated_total_duration = critical_path
         else:
             # Sum all task durations
             plan.estimated_total_duration = sum(
@@ -243,48 +415,96 @@ When creating a plan, consider:
         
         return plan
     
-    def _topological_sort(self, tasks: List[TaskNode]) -> List[TaskNode]:
+    def _analyze_plan(
+        self,
+        tasks: List[TaskNode]
+    ) -> Tuple[List[TaskNode], bool, int]:
         """
-        Sort tasks based on dependencies (topological sort).
+        Analyze the task graph in a single Kahn's algorithm pass.
         
         Args:
-            tasks: List of tasks to sort
+            tasks: List of tasks to analyze
             
         Returns:
-            Sorted list of tasks
+            Tuple of (sorted tasks, whether any dependency level holds more
+            than one task, critical path duration in seconds)
         """
-        # Create adjacency list
-        task_map = {task.id: task for task in tasks}
-        in_degree = {task.id: len(task.dependencies) for task in tasks}
-        adj_list = {task.id: [] for task in tasks}
+        # Plans without any dependencies only need priority ordering
+        if all(not task.dependencies for task in tasks):
+            return (
+                sorted(tasks, key=lambda t: -t.priority),
+                len(tasks) > 1,
+                max((task.estimated_duration for task in tasks), default=0)
+            )
         
-        for task in tasks:
+        # Index tasks once so the graph walk runs on integer-indexed lists
+        count = len(tasks)
+        id_to_idx = {task.id: i for i, task in enumerate(tasks)}
+        in_degree = [len(task.dependencies) for task in tasks]
+        adj_list: List[List[int]] = [[] for _ in range(count)]
+        
+        for i, task in enumerate(tasks):
             for dep in task.dependencies:
-                if dep in adj_list:
-                    adj_list[dep].append(task.id)
+                dep_idx = id_to_idx.get(dep)
+                if dep_idx is not None:
+                    adj_list[dep_idx].append(i)
         
-        # Find tasks with no dependencies
-        queue = [tid for tid, degree in in_degree.items() if degree == 0]
+        # Earliest start time and dependency level of every task
+        start = [0] * count
+        level = [0] * count
+        level_width = [0] * count
+        parallelizable = False
+        critical_path = 0
+        
+        # Ready tasks keyed on (-priority, index) so the highest priority pops
+        # first and ties keep the original order
+        heap = [(-task.priority, i) for i, task in enumerate(tasks) if in_degree[i] == 0]
+        heapq.heapify(heap)
         sorted_tasks = []
         
-        while queue:
-            # Sort by priority for tasks at the same level
-            queue.sort(key=lambda x: task_map[x].priority, reverse=True)
-            current = queue.pop(0)
-            sorted_tasks.append(task_map[current])
+        while heap:
+            _, current = heapq.heappop(heap)
+            task = tasks[current]
+            sorted_tasks.append(task)
+            
+            finish = start[current] + task.estimated_duration
+            if finish > critical_path:
+                critical_path = finish
+            
+            current_level = level[current]
+            level_width[current_level] += 1
+            if level_width[current_level] > 1:
+                parallelizable = True
             
             # Reduce in-degree for dependent tasks
             for neighbor in adj_list[current]:
+                if finish > start[neighbor]:
+                    start[neighbor] = finish
+                if current_level >= level[neighbor]:
+                    level[neighbor] = current_level + 1
                 in_degree[neighbor] -= 1
                 if in_degree[neighbor] == 0:
-                    queue.append(neighbor)
+                    heapq.heappush(heap, (-tasks[neighbor].priority, neighbor))
         
         # Check for cycles
         if len(sorted_tasks) != len(tasks):
             logger.warning("Circular dependencies detected in plan")
-            return tasks  # Return original order if cycle detected
+            # Return original order and run sequentially if cycle detected
+            return tasks, False, sum(task.estimated_duration for task in tasks)
         
-        return sorted_tasks
+        return sorted_tasks, parallelizable, critical_path
+    
+    def _topological_sort(self, tasks: List[TaskNode]) -> List[TaskNode]:
+        """
+        Sort tasks based on dependencies (topological sort).
+        
+        Args:
+            tasks: List of tasks to sort
+            
+        Returns:
+            Sorted list of tasks
+        """
+        return self._analyze_plan(tasks)[0]
     
     def _can_parallelize(self, tasks: List[TaskNode]) -> bool:
         """
@@ -296,17 +516,17 @@ When creating a plan, consider:
         Returns:
             True if parallel execution is possible
         """
-        # Check if there are any tasks without dependencies
-        # or multiple tasks at the same dependency level
-        levels = {}
+        # Two tasks without dependencies share the first level; stop early
+        roots = 0
         for task in tasks:
-            level = len(task.dependencies)
-            if level not in levels:
-                levels[level] = []
-            levels[level].append(task)
+            if not task.dependencies:
+                roots += 1
+                if roots > 1:
+                    return True
         
-        # If any level has multiple tasks, parallel execution is possible
-        return any(len(tasks) > 1 for tasks in levels.values())
+        # Otherwise compare real DAG levels; grouping by raw dependency count
+        # would misjudge tasks on different levels
+        return self._analyze_plan(tasks)[1]
     
     def _calculate_critical_path_duration(self, tasks: List[TaskNode]) -> int:
         """
@@ -318,28 +538,8 @@ When creating a plan, consider:
         Returns:
             Duration of the critical path in seconds
         """
-        task_map = {task.id: task for task in tasks}
-        durations = {}
-        
-        def get_duration(task_id: str) -> int:
-            if task_id in durations:
-                return durations[task_id]
-            
-            task = task_map[task_id]
-            if not task.dependencies:
-                durations[task_id] = task.estimated_duration
-            else:
-                max_dep_duration = max(
-                    get_duration(dep) for dep in task.dependencies
-                    if dep in task_map
-                ) if task.dependencies else 0
-                durations[task_id] = max_dep_duration + task.estimated_duration
-            
-            return durations[task_id]
-        
-        # Calculate duration for all tasks
-        for task in tasks:
-            get_duration(task.id)
-        
-        # Return the maximum duration
-        return max(durations.values()) if durations else 0
\ No newline at end of file
+        return self._analyze_plan(tasks)[2]
+
+
+# Agent class picked up by AgentRegistry.auto_discover
+AGENT_CLASS = PlannerAgent
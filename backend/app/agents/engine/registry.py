@@ -5,18 +5,58 @@ Provides a centralized registry for all available agents,
 enabling dynamic discovery and instantiation.
 """
 
-from typing import Dict, List, Optional, Type, Any
+from typing import Dict, FrozenSet, List, Optional, Set, Type, Any
+from collections import defaultdict
+from functools import lru_cache
+import asyncio
+import copy
 import logging
 from pathlib import Path
 import yaml
 import importlib
-import inspect
+import pkgutil
+
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
 
 from app.agents.engine.base import BaseAgent, AgentCapability
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=128)
+def _load_yaml(path: str, mtime_ns: int) -> Any:
+    """
+    Parse a YAML file, cached on its path and modification time.
+    
+    The parsed object is shared between callers and must not be mutated.
+    
+    Args:
+        path: Path to the YAML file
+        mtime_ns: File modification time, so edited files are re-parsed
+        
+    Returns:
+        The parsed YAML content
+    """
+    with open(path, 'r') as f:
+        return yaml.load(f, Loader=YamlLoader)
+
+
+def load_yaml_config(path: Path) -> Any:
+    """
+    Load a YAML config file through the parse cache.
+    
+    Args:
+        path: Path to the YAML file
+        
+    Returns:
+        A private copy of the parsed YAML content, safe to mutate
+    """
+    return copy.deepcopy(_load_yaml(str(path), path.stat().st_mtime_ns))
+
+
 class AgentRegistry:
     """
     Central registry for all agents in the system.
@@ -33,6 +73,11 @@ class AgentRegistry:
         self._agents: Dict[str, Type[BaseAgent]] = {}
         self._configs: Dict[str, Dict[str, Any]] = {}
         self._instances: Dict[str, BaseAgent] = {}
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._by_capability: Dict[AgentCapability, Set[str]] = defaultdict(set)
+        self._unindexed: Set[str] = set()
+        # Capabilities read from instances of agents that declare none on the class
+        self._instance_capabilities: Dict[str, FrozenSet[AgentCapability]] = {}
         
     def register(
         self,
@@ -58,6 +103,8 @@ class AgentRegistry:
         if config:
             self._configs[agent_id] = config
         
+        self._index_capabilities(agent_id)
+        
         logger.info(f"Registered agent: {agent_id} ({agent_class.__name__})")
     
     def unregister(self, agent_id: str) -> None:
@@ -71,8 +118,9 @@ class AgentRegistry:
             del self._agents[agent_id]
             if agent_id in self._configs:
                 del self._configs[agent_id]
-            if agent_id in self._instances:
-                del self._instances[agent_id]
+            self._instances.pop(agent_id, None)
+            self._pending.pop(agent_id, None)
+            self._unindex_capabilities(agent_id)
             logger.info(f"Unregistered agent: {agent_id}")
     
     def get_agent_class(self, agent_id: str) -> Optional[Type[BaseAgent]]:
@@ -103,9 +151,85 @@ class AgentRegistry:
             The agent instance or None if not found
         """
         # Check if instance already exists
-        if agent_id in self._instances and not override_config:
-            return self._instances[agent_id]
+        if not override_config:
+            instance = self._instances.get(agent_id)
+            if instance is not None:
+                return instance
+        
+        instance = self._create_instance(agent_id, override_config)
+        
+        # Cache if no overrides; setdefault keeps the first published instance
+        if instance is None or override_config:
+            return instance
+        return self._instances.setdefault(agent_id, instance)
+    
+    async def aget_agent_instance(
+        self,
+        agent_id: str,
+        **override_config
+    ) -> Optional[BaseAgent]:
+        """
+        Get or create an agent instance without blocking the event loop.
+        
+        Construction runs in a worker thread, and concurrent callers for the
+        same agent await a single in-flight construction.
+        
+        Args:
+            agent_id: The agent ID
+            **override_config: Configuration overrides
+            
+        Returns:
+            The agent instance or None if not found
+        """
+        if override_config:
+            return await asyncio.to_thread(self._create_instance, agent_id, override_config)
+        
+        instance = self._instances.get(agent_id)
+        if instance is not None:
+            return instance
         
+        # Construction runs in its own task, so a cancelled caller only stops
+        # waiting and never cancels the build other callers are awaiting
+        pending = self._pending.get(agent_id)
+        if pending is None:
+            pending = asyncio.ensure_future(self._construct_instance(agent_id))
+            self._pending[agent_id] = pending
+            pending.add_done_callback(
+                lambda task: self._pending.pop(agent_id, None)
+                if self._pending.get(agent_id) is task else None
+            )
+        return await asyncio.shield(pending)
+    
+    async def _construct_instance(self, agent_id: str) -> Optional[BaseAgent]:
+        """
+        Build and cache the shared instance of an agent in a worker thread.
+        
+        Args:
+            agent_id: The agent ID
+            
+        Returns:
+            The cached agent instance or None if not found
+        """
+        instance = await asyncio.to_thread(self._create_instance, agent_id, {})
+        if instance is not None:
+            instance = self._instances.setdefault(agent_id, instance)
+        return instance
+    
+    def _create_instance(
+        self,
+        agent_id: str,
+        override_config: Dict[str, Any]
+    ) -> Optional[BaseAgent]:
+        """
+        Instantiate an agent with its merged configuration.
+        
+        Args:
+            agent_id: The agent ID
+            override_config: Configuration overrides
+            
+        Returns:
+            The new agent instance or None on failure
+        """
         # Get the agent class
         agent_class = self._agents.get(agent_id)
         if not agent_class:
@@ -118,13 +242,7 @@ class AgentRegistry:
         
         try:
             # Create new instance
-            instance = agent_class(agent_id=agent_id, **config)
-            
-            # Cache if no overrides
-            if not override_config:
-                self._instances[agent_id] = instance
-            
-            return instance
+            return agent_class(agent_id=agent_id, **config)
             
         except Exception as e:
             logger.error(f"Failed to instantiate agent {agent_id}: {e}")
@@ -152,14 +270,60 @@ class AgentRegistry:
         Returns:
             List of agent IDs with the capability
         """
-        matching_agents = []
-        
-        for agent_id in self._agents:
+        # Agents without declared capabilities are instantiated once, then indexed
+        for agent_id in list(self._unindexed):
             instance = self.get_agent_instance(agent_id)
-            if instance and instance.has_capability(capability):
-                matching_agents.append(agent_id)
+            self._unindexed.discard(agent_id)
+            if instance:
+                capabilities = frozenset(instance.get_capabilities())
+                self._instance_capabilities[agent_id] = capabilities
+                for cap in capabilities:
+                    self._by_capability[cap].add(agent_id)
         
-        return matching_agents
+        return list(self._by_capability.get(capability, ()))
+    
+    def _index_capabilities(self, agent_id: str) -> None:
+        """
+        Index an agent's declared capabilities without instantiating it.
+        
+        Capabilities are read from the class-level ``CAPABILITIES`` attribute,
+        then from the ``capabilities`` list of the agent's YAML config. Agents
+        declaring neither are indexed lazily on the first capability lookup.
+        
+        Args:
+            agent_id: The agent to index
+        """
+        self._unindex_capabilities(agent_id)
+        
+        capabilities = self._agents[agent_id].CAPABILITIES
+        if capabilities is None:
+            declared = self._configs.get(agent_id, {}).get("capabilities")
+            if declared is not None:
+                capabilities = []
+                for value in declared:
+                    try:
+                        capabilities.append(AgentCapability(value))
+                    except ValueError:
+                        logger.warning(f"Unknown capability '{value}' for agent {agent_id}")
+        
+        if capabilities is None:
+            self._unindexed.add(agent_id)
+            return
+        
+        for cap in capabilities:
+            self._by_capability[cap].add(agent_id)
+    
+    def _unindex_capabilities(self, agent_id: str) -> None:
+        """
+        Remove an agent from the capability index.
+        
+        Args:
+            agent_id: The agent to remove
+        """
+        self._unindexed.discard(agent_id)
+        self._instance_capabilities.pop(agent_id, None)
+        for agent_ids in self._by_capability.values():
+            agent_ids.discard(agent_id)
     
     def load_from_directory(self, directory: Path) -> None:
         """
@@ -175,8 +339,7 @@ class AgentRegistry:
         # Load YAML configurations
         for yaml_file in directory.glob("*.yaml"):
             try:
-                with open(yaml_file, 'r') as f:
-                    config = yaml.safe_load(f)
+                config = load_yaml_config(yaml_file)
                 
                 if not config:
                     continue
@@ -208,38 +371,44 @@ class AgentRegistry:
         """
         import app.agents.engine as engine_module
         
-        # Get all modules in the engine package
-        engine_path = Path(engine_module.__file__).parent
+        # Get all modules in the engine package (a namespace package, so use __path__)
+        engine_paths = list(engine_module.__path__)
+        definitions_path = Path(engine_paths[0]).parent / "definitions"
         
-        for py_file in engine_path.glob("*.py"):
-            if py_file.stem in ['__init__', 'base', 'registry']:
+        for module_info in pkgutil.iter_modules(engine_paths):
+            if module_info.name in ['__init__', 'base', 'registry']:
                 continue
             
-            module_name = f"app.agents.engine.{py_file.stem}"
+            module_name = f"app.agents.engine.{module_info.name}"
             
             try:
                 module = importlib.import_module(module_name)
                 
-                # Find all BaseAgent subclasses in the module
-                for name, obj in inspect.getmembers(module):
-                    if (inspect.isclass(obj) and 
-                        issubclass(obj, BaseAgent) and 
-                        obj != BaseAgent):
-                        
-                        # Generate agent ID from class name
-                        agent_id = py_file.stem
-                        
-                        # Check if config exists
-                        config_file = engine_path.parent / "definitions" / f"{agent_id}.yaml"
-                        config = {}
-                        
-                        if config_file.exists():
-                            with open(config_file, 'r') as f:
-                                config = yaml.safe_load(f) or {}
-                        
-                        # Register the agent
-                        self.register(agent_id, obj, config)
-                        break  # Only one agent per module
+                # Prefer the declared agent class, else scan the module namespace
+                agent_class = getattr(module, "AGENT_CLASS", None) or next(
+                    (
+                        obj for obj in vars(module).values()
+                        if isinstance(obj, type)
+                        and issubclass(obj, BaseAgent)
+                        and obj is not BaseAgent
+                    ),
+                    None
+                )
+                if agent_class is None:
+                    continue
+                
+                # Generate agent ID from module name
+                agent_id = module_info.name
+                
+                # Check if config exists
+                config_file = definitions_path / f"{agent_id}.yaml"
+                config = {}
+                
+                if config_file.exists():
+                    config = load_yaml_config(config_file) or {}
+                
+                # Register the agent (only one agent per module)
+                self.register(agent_id, agent_class, config)
                         
             except Exception as e:
                 logger.warning(f"Could not auto-discover from {module_name}: {e}")
@@ -260,8 +429,16 @@ class AgentRegistry:
         
         config = self._configs.get(agent_id, {})
         
-        # Try to get an instance to extract capabilities
-        instance = self.get_agent_instance(agent_id)
+        # Read class-level capabilities; instantiate only for agents without
+        # them, remembering the result here rather than on the shared class
+        capabilities = agent_class.CAPABILITIES
+        if capabilities is None:
+            capabilities = self._instance_capabilities.get(agent_id)
+        if capabilities is None:
+            instance = self.get_agent_instance(agent_id)
+            if instance:
+                capabilities = frozenset(instance.get_capabilities())
+                self._instance_capabilities[agent_id] = capabilities
         
         return {
             "id": agent_id,
@@ -269,7 +446,7 @@ class AgentRegistry:
             "module": agent_class.__module__,
             "name": config.get("name", agent_id),
             "description": config.get("description", agent_class.__doc__),
-            "capabilities": [cap.value for cap in instance.get_capabilities()] if instance else [],
+            "capabilities": [cap.value for cap in AgentCapability if cap in capabilities] if capabilities else [],
             "config": config
         }
     
@@ -278,6 +455,10 @@ class AgentRegistry:
         self._agents.clear()
         self._configs.clear()
         self._instances.clear()
+        self._pending.clear()
+        self._by_capability.clear()
+        self._unindexed.clear()
+        self._instance_capabilities.clear()
         logger.info("Cleared agent registry")
 
 
@@ -8,39 +8,219 @@ The Researcher agent is responsible for:
 - Knowledge synthesis and summarization
 """
 
-from typing import List, Dict, Any, AsyncIterator, Optional
+from typing import List, Dict, Any, AsyncIterator, Iterator, Optional, ClassVar, FrozenSet, Tuple, Union
+import asyncio
+import copy
+import hashlib
 import json
 import logging
-from datetime import datetime
+import math
+import re
+import sys
+from collections import Counter, defaultdict
+from functools import lru_cache
 
-from langchain_core.messages import BaseMessage, HumanMessage, AIMessage
-from langchain_core.prompts import ChatPromptTemplate
+import numpy as np
+from cachetools import LRUCache, TTLCache
+from langchain_core.messages import BaseMessage, AIMessage, SystemMessage
+from langchain_core.prompts import (
+    ChatPromptTemplate, HumanMessagePromptTemplate, SystemMessagePromptTemplate
+)
 from langchain_core.tools import BaseTool
 from langchain.tools import DuckDuckGoSearchRun
 from langchain_community.tools import WikipediaQueryRun
 from langchain_community.utilities import WikipediaAPIWrapper
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 from app.agents.engine.base import (
-    BaseAgent, AgentEvent, AgentRequest, AgentCapability, AgentStatus
+    BaseAgent, AgentEvent, AgentRequest, AgentCapability, AgentStatus,
+    cached_text_block, utc_now_iso
 )
+from app.core.redis_manager import redis_manager
+from app.core.semantic_cache import SemanticCache
+
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+_WHITESPACE_RE = re.compile(r"\s+")
+_WORD_RE = re.compile(r"\w+")
+# A bulleted line, or a plain line of 21-199 characters once stripped
+_KEY_POINT_RE = re.compile(r"^[ \t]*(?:[-•*][ \t]*(.*?)|(\S.{19,197}\S))[ \t]*\r?$", re.M)
+
+# Rough token size used when no tokenizer is available for the model
+_CHARS_PER_TOKEN = 4
+
+# Kept free of template variables so it forms a byte-identical prompt prefix
+_RESEARCHER_SYSTEM_PROMPT = """You are the Researcher Agent, an expert at finding, analyzing, and synthesizing information.
+
+Your responsibilities:
+1. Search for relevant information from multiple sources
+2. Verify facts and cross-reference information
+3. Synthesize findings into clear, actionable insights
+4. Identify knowledge gaps and uncertainties
+5. Provide well-sourced, accurate information
+
+Research principles:
+- Always cite your sources
+- Distinguish between facts and opinions
+- Note confidence levels in your findings
+- Highlight conflicting information when found
+- Prioritize recent and authoritative sources
+
+When researching:
+1. Start with a broad search to understand the topic
+2. Deep dive into specific aspects
+3. Cross-reference information from multiple sources
+4. Synthesize findings into a coherent narrative
+5. Draw conclusions and make recommendations"""
+
+
+@lru_cache(maxsize=8)
+def _get_encoding(model_name: Optional[str]) -> Optional[Any]:
+    """Get the tiktoken encoding for a model, or None if unavailable."""
+    if not TIKTOKEN_AVAILABLE:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model_name or "")
+    except KeyError:
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        logger.warning(f"Tokenizer unavailable, estimating token counts: {e}")
+        return None
+
+
+# Default research tools, kept once every tool was created or its package
+# is known to be missing
+_default_tool_cache: Optional[Tuple[BaseTool, ...]] = None
+
+
+def _default_tools() -> Tuple[BaseTool, ...]:
+    """
+    Build the default research tools once per process.
+    
+    A set missing a tool for any reason other than an uninstalled package
+    is not cached, so a transient failure is retried on the next call.
+    """
+    global _default_tool_cache
+    if _default_tool_cache is not None:
+        return _default_tool_cache
+    
+    tools = []
+    complete = True
+    
+    try:
+        # Web search tool
+        search_tool = DuckDuckGoSearchRun()
+        tools.append(search_tool)
+    except ImportError as e:
+        logger.warning(f"Could not initialize web search: {e}")
+    except Exception as e:
+        logger.warning(f"Could not initialize web search: {e}")
+        complete = False
+    
+    try:
+        # Wikipedia tool
+        wikipedia_wrapper = WikipediaAPIWrapper(
+            top_k_results=3,
+            doc_content_chars_max=4000
+        )
+        wikipedia_tool = WikipediaQueryRun(api_wrapper=wikipedia_wrapper)
+        tools.append(wikipedia_tool)
+    except ImportError as e:
+        logger.warning(f"Could not initialize Wikipedia tool: {e}")
+    except Exception as e:
+        logger.warning(f"Could not initialize Wikipedia tool: {e}")
+        complete = False
+    
+    tools = tuple(tools)
+    if complete:
+        _default_tool_cache = tools
+    return tools
+
+
+def _bm25_scores(
+    query: str,
+    results: List[Dict[str, Any]],
+    k1: float = 1.5,
+    b: float = 0.75
+) -> List[float]:
+    """
+    Score search results by Okapi BM25 of their content against a query.
+    
+    Args:
+        query: Search query
+        results: Search results
+        k1: Term frequency saturation
+        b: Document length normalization
+        
+    Returns:
+        Score per result, in input order
+    """
+    terms = set(_WORD_RE.findall(query.lower()))
+    if not terms or not results:
+        return [0.0] * len(results)
+    
+    counts = [Counter(_WORD_RE.findall(str(r.get("content", "")).lower())) for r in results]
+    lengths = [sum(c.values()) for c in counts]
+    avg_length = (sum(lengths) / len(lengths)) or 1.0
+    
+    n = len(results)
+    idf = {}
+    for term in terms:
+        df = sum(1 for c in counts if term in c)
+        idf[term] = math.log(1 + (n - df + 0.5) / (df + 0.5))
+    
+    scores = []
+    for c, length in zip(counts, lengths):
+        norm = k1 * (1 - b + b * length / avg_length)
+        scores.append(sum(
+            idf[term] * c[term] * (k1 + 1) / (c[term] + norm)
+            for term in terms if term in c
+        ))
+    return scores
+
+
+def _bm25_rank(query: str, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Order search results by BM25 score against a query.
+    
+    Args:
+        query: Search query
+        results: Search results
+        
+    Returns:
+        Results sorted by descending score, ties keeping their original order
+    """
+    if len(results) < 2:
+        return list(results)
+    
+    scores = _bm25_scores(query, results)
+    order = sorted(range(len(results)), key=lambda i: -scores[i])
+    return [results[i] for i in order]
+
 
 class ResearchResult(BaseModel):
     """Represents a research finding."""
+    model_config = ConfigDict(frozen=True, extra="ignore")
+    
     source: str = Field(..., description="Source of the information")
     url: Optional[str] = Field(None, description="URL if available")
     title: str = Field(..., description="Title or heading")
     content: str = Field(..., description="Content or summary")
     relevance_score: float = Field(default=0.0, description="Relevance score (0-1)")
-    timestamp: str = Field(default_factory=lambda: datetime.utcnow().isoformat())
+    timestamp: str = Field(default_factory=utc_now_iso)
     metadata: Dict[str, Any] = Field(default_factory=dict)
 
 
 class ResearchReport(BaseModel):
     """Complete research report."""
+    model_config = ConfigDict(frozen=True, extra="ignore")
+    
     query: str = Field(..., description="Original research query")
     summary: str = Field(..., description="Executive summary of findings")
     findings: List[ResearchResult] = Field(..., description="Detailed findings")
@@ -61,74 +241,76 @@ class ResearcherAgent(BaseAgent):
     - Knowledge organization and summarization
     """
     
+    CAPABILITIES: ClassVar[FrozenSet[AgentCapability]] = frozenset({
+        AgentCapability.RESEARCH,
+        AgentCapability.ANALYSIS,
+        AgentCapability.MEMORY_ACCESS
+    })
+    
     def _initialize(self) -> None:
         """Initialize researcher-specific components."""
-        self.capabilities = [
-            AgentCapability.RESEARCH,
-            AgentCapability.ANALYSIS,
-            AgentCapability.MEMORY_ACCESS
-        ]
-        
         # Initialize search tools if not provided
         if not self.tools:
             self.tools = self._create_default_tools()
         
-        # Cache for search results
-        self.search_cache: Dict[str, List[Dict]] = {}
+        # Bounded cache for search results, keyed by normalized query
+        self.search_cache: TTLCache = TTLCache(
+            maxsize=self.config.get("search_cache_size", 512),
+            ttl=self.config.get("search_cache_ttl", 3600)
+        )
         
-    def _create_default_tools(self) -> List[BaseTool]:
-        """Create default research tools."""
-        tools = []
+        # Finished reports, expiring with the search results they were built from
+        self.report_cache: TTLCache = TTLCache(
+            maxsize=self.config.get("report_cache_size", 256),
+            ttl=self.config.get("search_cache_ttl", 3600)
+        )
         
-        try:
-            # Web search tool
-            search_tool = DuckDuckGoSearchRun()
-            tools.append(search_tool)
-        except Exception as e:
-            logger.warning(f"Could not initialize web search: {e}")
+        # Prompt template for the analysis call, built once
+        self._prompt = self._create_prompt()
         
-        try:
-            # Wikipedia tool
-            wikipedia_wrapper = WikipediaAPIWrapper(
-                top_k_results=3,
-                doc_content_chars_max=4000
-            )
-            wikipedia_tool = WikipediaQueryRun(api_wrapper=wikipedia_wrapper)
-            tools.append(wikipedia_tool)
-        except Exception as e:
-            logger.warning(f"Could not initialize Wikipedia tool: {e}")
+        # Redis-backed cache shared across workers; skipped while Redis is down
+        self.shared_search_cache = self.config.get("shared_search_cache", True)
+        
+        # Per-query locks so concurrent misses share one upstream search
+        self._search_locks: Dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+        # Callers holding or waiting on each lock, so it is dropped only once unused
+        self._search_lock_users: Dict[str, int] = defaultdict(int)
         
-        return tools
+        # Semantic caches for paraphrased queries, enabled when embeddings are configured
+        self.embeddings = self.config.get("embeddings")
+        threshold = self.config.get("semantic_cache_threshold", 0.92)
+        self._search_semantic_cache = SemanticCache(self.embeddings, threshold) if self.embeddings else None
+        self._analysis_semantic_cache = SemanticCache(self.embeddings, threshold) if self.embeddings else None
+        self._report_semantic_cache = SemanticCache(self.embeddings, threshold) if self.embeddings else None
+        self._query_vectors: LRUCache = LRUCache(maxsize=256)
+    
+    def _create_default_tools(self) -> List[BaseTool]:
+        """Create default research tools, shared by every researcher in the process."""
+        return list(_default_tools())
     
     def _create_prompt(self) -> ChatPromptTemplate:
-        """Create the researcher's prompt template."""
-        return ChatPromptTemplate.from_messages([
-            ("system", """You are the Researcher Agent, an expert at finding, analyzing, and synthesizing information.
-
-Your responsibilities:
-1. Search for relevant information from multiple sources
-2. Verify facts and cross-reference information
-3. Synthesize findings into clear, actionable insights
-4. Identify knowledge gaps and uncertainties
-5. Provide well-sourced, accurate information
-
-Research principles:
-- Always cite your sources
-- Distinguish between facts and opinions
-- Note confidence levels in your findings
-- Highlight conflicting information when found
-- Prioritize recent and authoritative sources
-
-Available tools: {tools}
-
-When researching:
-1. Start with a broad search to understand the topic
-2. Deep dive into specific aspects
-3. Cross-reference information from multiple sources
-4. Synthesize findings into a coherent narrative
-5. Draw conclusions and make recommendations"""),
-            ("human", "{query}"),
-            ("system", "Conduct thorough research on this topic and provide comprehensive findings.")
+        """
+        Create the researcher's prompt template.
+        
+        The leading system message is a fixed string so providers can cache
+        it as a prefix; the tool listing and the query follow it. For Anthropic
+        models both system blocks are marked cacheable.
+        """
+        if self.supports_prompt_caching():
+            system_message = SystemMessage(content=[cached_text_block(_RESEARCHER_SYSTEM_PROMPT)])
+            tools_template = SystemMessagePromptTemplate.from_template([
+                cached_text_block("Available tools: {tools}")
+            ])
+        else:
+            system_message = SystemMessage(content=_RESEARCHER_SYSTEM_PROMPT)
+            tools_template = SystemMessagePromptTemplate.from_template("Available tools: {tools}")
+        
+        return ChatPromptTemplate(messages=[
+            system_message,
+            tools_template,
+            HumanMessagePromptTemplate.from_template(
+                "Conduct thorough research on this topic and provide comprehensive findings.\n\n{query}"
+            )
         ])
     
     async def _execute_core(
@@ -149,6 +331,37 @@ When researching:
         try:
             # Update status
             self.status = AgentStatus.EXECUTING
+            
+            # Serve a finished report for the same (or a paraphrased) query directly
+            key = self._cache_key(request.query)
+            report = self.report_cache.get(key)
+            vector = None
+            if report is not None:
+                # Callers may edit the report, so the cached one is never handed out
+                report = copy.deepcopy(report)
+            elif self._report_semantic_cache:
+                vector = await self._query_vector(key)
+                report = self._report_semantic_cache.lookup_vector(vector)
+                if report is not None:
+                    # A paraphrase's report, reissued under this query
+                    report = copy.deepcopy(report)
+                    report["query"] = request.query
+                    report["generated_at"] = utc_now_iso()
+            
+            if report is not None:
+                logger.info(f"Using cached report for: {request.query}")
+                yield self._create_event("research_started", {
+                    "query": request.query,
+                    "tools_available": [tool.name for tool in self.tools],
+                    "cached": True
+                })
+                yield self._create_event("research_complete", {
+                    "report": report
+                })
+                if request.context:
+                    request.context.metadata["research_report"] = report
+                return
+            
             yield self._create_event("research_started", {
                 "query": request.query,
                 "tools_available": [tool.name for tool in self.tools]
@@ -160,7 +373,13 @@ When researching:
                 "message": "Conducting initial search..."
             })
             
-            search_results = await self._conduct_search(request.query)
+            search_results, timed_out = await self._conduct_search(request.query)
+            
+            if timed_out:
+                yield self._create_event("search_partial", {
+                    "completed": [tool.name for tool in self.tools if tool.name not in timed_out],
+                    "timed_out": timed_out
+                })
             
             if search_results:
                 yield self._create_event("search_results", {
@@ -174,8 +393,15 @@ When researching:
                 "message": "Analyzing findings in detail..."
             })
             
-            # Use LLM to analyze search results
-            analysis = await self._analyze_findings(request.query, search_results)
+            # Use LLM to analyze search results, forwarding tokens as they stream
+            analysis: Dict[str, Any] = {}
+            async for item in self._analyze_findings(
+                request.query, search_results, stream=request.stream
+            ):
+                if isinstance(item, AgentEvent):
+                    yield item
+                else:
+                    analysis = item
             
             # Phase 3: Synthesis
             yield self._create_event("phase", {
@@ -186,6 +412,13 @@ When researching:
             # Create research report
             report = await self._create_report(request.query, search_results, analysis)
             
+            # Only cache reports backed by a complete search and a successful analysis
+            if not timed_out and analysis.get("confidence", 0.0) > 0:
+                cached = copy.deepcopy(report)
+                self.report_cache[key] = cached
+                if self._report_semantic_cache:
+                    self._report_semantic_cache.add(vector, cached)
+            
             # Emit the complete report
             yield self._create_event("research_complete", {
                 "report": report
@@ -202,7 +435,7 @@ When researching:
             })
             raise
     
-    async def _conduct_search(self, query: str) -> List[Dict[str, Any]]:
+    async def _conduct_search(self, query: str) -> Tuple[List[Dict[str, Any]], List[str]]:
         """
         Conduct searches using available tools.
         
@@ -210,77 +443,272 @@ When researching:
             query: Search query
             
         Returns:
-            List of search results
+            Tuple of (search results, names of tools that timed out)
         """
+        key = self._cache_key(query)
+        
         # Check cache first
-        if query in self.search_cache:
+        cached = self.search_cache.get(key)
+        if cached is not None:
             logger.info(f"Using cached results for: {query}")
-            return self.search_cache[query]
-        
-        results = []
+            return cached, []
         
-        for tool in self.tools:
-            try:
-                if hasattr(tool, 'run'):
-                    # Synchronous tool
-                    result = tool.run(query)
-                elif hasattr(tool, 'arun'):
-                    # Asynchronous tool
-                    result = await tool.arun(query)
-                else:
-                    continue
+        lock = self._search_locks[key]
+        self._search_lock_users[key] += 1
+        try:
+            async with lock:
+                # Another caller may have filled the cache while we waited
+                cached = self.search_cache.get(key)
+                if cached is not None:
+                    return cached, []
                 
-                # Parse and structure the result
-                if isinstance(result, str):
-                    results.append({
-                        "source": tool.name,
-                        "content": result,
-                        "timestamp": datetime.utcnow().isoformat()
-                    })
-                elif isinstance(result, dict):
-                    result["source"] = tool.name
-                    results.append(result)
-                elif isinstance(result, list):
-                    for item in result:
-                        if isinstance(item, dict):
-                            item["source"] = tool.name
-                            results.append(item)
+                # Results another worker (or an earlier process) already fetched
+                shared_key = hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+                if self.shared_search_cache:
+                    cached = await redis_manager.get_search_results(shared_key)
+                    if cached:
+                        logger.info(f"Using shared cached results for: {query}")
+                        self.search_cache[key] = cached
+                        return cached, []
                 
-            except Exception as e:
-                logger.warning(f"Search tool {tool.name} failed: {e}")
+                # Fall back to a paraphrase match before hitting the tools
+                vector = None
+                if self._search_semantic_cache:
+                    vector = await self._query_vector(key)
+                    cached = self._search_semantic_cache.lookup_vector(vector)
+                    if cached is not None:
+                        logger.info(f"Using semantically cached results for: {query}")
+                        self.search_cache[key] = cached
+                        return cached, []
+                
+                results, timed_out = await self._search_tools(query)
+                results = self._dedup_results(results)
+                
+                # Cache results; empty or partial results are not cached so they get retried
+                if results and not timed_out:
+                    self.search_cache[key] = results
+                    if self.shared_search_cache:
+                        await redis_manager.save_search_results(
+                            shared_key, results, ttl=self.config.get("search_cache_ttl", 3600)
+                        )
+                    if self._search_semantic_cache:
+                        self._search_semantic_cache.add(vector, results)
+                
+                return results, timed_out
+        finally:
+            # A released lock still has queued waiters until they run, so
+            # count users instead of checking lock.locked()
+            self._search_lock_users[key] -= 1
+            if not self._search_lock_users[key]:
+                del self._search_lock_users[key]
+                self._search_locks.pop(key, None)
+    
+    async def _search_tools(self, query: str) -> Tuple[List[Dict[str, Any]], List[str]]:
+        """
+        Query every available tool and structure the results.
+        
+        Args:
+            query: Search query
+            
+        Returns:
+            Tuple of (search results, names of tools that timed out)
+        """
+        # Fan out to every tool concurrently, bounded by the semaphore and a per-tool timeout
+        semaphore = asyncio.Semaphore(self.config.get("max_search_concurrency", 5))
+        timeout = self.config.get("search_timeout", 5.0)
+        async with asyncio.TaskGroup() as group:
+            tasks = [
+                group.create_task(self._run_tool(tool, query, semaphore, timeout))
+                for tool in self.tools
+            ]
+        
+        results = []
+        timed_out = []
+        now = utc_now_iso()
+        
+        for tool, task in zip(self.tools, tasks):
+            result = task.result()
+            if isinstance(result, TimeoutError):
+                logger.warning(f"Search tool {tool.name} timed out after {timeout}s")
+                timed_out.append(tool.name)
+                continue
+            if isinstance(result, Exception):
+                logger.warning(f"Search tool {tool.name} failed: {result}")
+                continue
+            
+            # Parse and structure the result
+            if isinstance(result, str):
+                results.append({
+                    "source": tool.name,
+                    "content": result,
+                    "timestamp": now
+                })
+            elif isinstance(result, dict):
+                result["source"] = tool.name
+                results.append(result)
+            elif isinstance(result, list):
+                for item in result:
+                    if isinstance(item, dict):
+                        item["source"] = tool.name
+                        results.append(item)
+        
+        return results, timed_out
+    
+    async def _query_vector(self, key: str) -> Optional[Any]:
+        """
+        Embed a normalized query once and share it between semantic caches.
+        
+        Args:
+            key: Normalized query
+            
+        Returns:
+            Normalized query vector, or None if embedding failed
+        """
+        if key in self._query_vectors:
+            return self._query_vectors[key]
+        
+        cache = self._search_semantic_cache or self._analysis_semantic_cache
+        vector = await cache.embed(key)
+        if vector is not None:
+            self._query_vectors[key] = vector
+        return vector
+    
+    @staticmethod
+    def _results_digest(search_results: List[Dict[str, Any]]) -> str:
+        """
+        Fingerprint a set of search results.
+        
+        Args:
+            search_results: Search results
+            
+        Returns:
+            Digest that is stable under result reordering
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        for source, content in sorted(
+            (str(r.get("source", "")), str(r.get("content", ""))) for r in search_results
+        ):
+            digest.update(source.encode())
+            digest.update(b"\0")
+            digest.update(content.encode())
+            digest.update(b"\0")
+        return digest.hexdigest()
+    
+    @staticmethod
+    def _dedup_results(search_results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Drop search results whose content duplicates an earlier result.
         
-        # Cache results
-        self.search_cache[query] = results
+        Content is compared by a digest of its first 1024 characters,
+        lowercased and whitespace-collapsed. A duplicate from a different
+        source is kept once, so corroboration across sources survives.
         
-        return results
+        Args:
+            search_results: Search results in priority order
+            
+        Returns:
+            Deduplicated results in their original order
+        """
+        seen: Dict[bytes, List[str]] = {}
+        deduped = []
+        for result in search_results:
+            normalized = _WHITESPACE_RE.sub(" ", str(result.get("content", "")).lower()).strip()
+            digest = hashlib.blake2b(normalized[:1024].encode(), digest_size=16).digest()
+            sources = seen.setdefault(digest, [])
+            source = result.get("source")
+            if len(sources) >= 2 or source in sources:
+                continue
+            sources.append(source)
+            deduped.append(result)
+        return deduped
+    
+    @staticmethod
+    def _cache_key(query: str) -> str:
+        """
+        Normalize a query for cache lookups.
+        
+        Args:
+            query: Raw query
+            
+        Returns:
+            Lowercased, whitespace-collapsed query without trailing punctuation
+        """
+        return _WHITESPACE_RE.sub(" ", query.strip().lower()).rstrip("?.!")
+    
+    async def _run_tool(
+        self,
+        tool: BaseTool,
+        query: str,
+        semaphore: asyncio.Semaphore,
+        timeout: float
+    ) -> Any:
+        """
+        Run a single search tool without blocking the event loop.
+        
+        Errors are returned rather than raised so one failing or slow tool
+        never cancels its siblings in the task group.
+        
+        Args:
+            tool: The tool to run
+            query: Search query
+            semaphore: Bounds the number of concurrent tool calls
+            timeout: Seconds to wait for the tool before giving up
+            
+        Returns:
+            Raw tool output, or the exception the tool raised
+        """
+        async with semaphore:
+            try:
+                if hasattr(tool, 'arun'):
+                    return await asyncio.wait_for(tool.arun(query), timeout)
+                # Blocking tools run in a worker thread
+                return await asyncio.wait_for(asyncio.to_thread(tool.run, query), timeout)
+            except Exception as e:
+                return e
     
     async def _analyze_findings(
         self,
         query: str,
-        search_results: List[Dict[str, Any]]
-    ) -> Dict[str, Any]:
+        search_results: List[Dict[str, Any]],
+        stream: bool = True
+    ) -> AsyncIterator[Union[AgentEvent, Dict[str, Any]]]:
         """
         Analyze search results using LLM.
         
         Args:
             query: Original query
             search_results: Raw search results
+            stream: Whether to stream the analysis as it is generated
             
-        Returns:
-            Analysis dictionary
+        Yields:
+            analysis_token events while streaming, then the analysis dictionary
         """
         if not search_results:
-            return {
+            yield {
                 "summary": "No search results found.",
                 "key_points": [],
                 "confidence": 0.0
             }
+            return
         
-        # Prepare context for LLM
-        context = f"Research Query: {query}\n\nSearch Results:\n"
-        for i, result in enumerate(search_results[:10], 1):  # Limit to top 10
-            context += f"\n{i}. Source: {result.get('source', 'Unknown')}\n"
-            context += f"   Content: {result.get('content', '')[:500]}...\n"
+        # Reuse the analysis of a paraphrased query over the same results
+        sources_digest = self._results_digest(search_results)
+        vector = None
+        if self._analysis_semantic_cache:
+            vector = await self._query_vector(self._cache_key(query))
+            cached = self._analysis_semantic_cache.lookup_vector(vector)
+            if cached is not None and cached["sources_digest"] == sources_digest:
+                logger.info(f"Using semantically cached analysis for: {query}")
+                yield cached["analysis"]
+                return
+        
+        # Prepare context for LLM, highest-signal results first within the token budget
+        ranked = _bm25_rank(query, search_results)[:10]  # Limit to top 10
+        budget = self.config.get("analysis_token_budget", 6000)
+        context = (
+            "Research Query: " + query + "\n\nSearch Results:\n"
+            + "\n".join(self._iter_snippets(ranked, budget))
+        )
         
         analysis_prompt = f"""{context}
 
@@ -291,23 +719,93 @@ Based on these search results, provide:
 4. Confidence level in the findings (0-1)
 5. Gaps in the available information"""
         
+        # Static system prefix first, so providers can serve it from cache
+        analysis_messages = self._prompt.format_messages(
+            tools=", ".join(tool.name for tool in self.tools),
+            query=analysis_prompt
+        )
+        
         try:
-            response = await self.llm.ainvoke([HumanMessage(content=analysis_prompt)])
+            if stream:
+                # Forward tokens as they arrive and keep the full text for parsing
+                buffer = []
+                async for chunk in self.llm.astream(analysis_messages):
+                    delta = chunk.content if isinstance(chunk.content, str) else "".join(
+                        block.get("text", "") for block in chunk.content if isinstance(block, dict)
+                    )
+                    if delta:
+                        buffer.append(delta)
+                        yield self._create_event("analysis_token", {"delta": delta})
+                content = "".join(buffer)
+            else:
+                response = await self.llm.ainvoke(analysis_messages)
+                content = response.content
             
             # Parse the response (in production, use structured output)
-            return {
-                "summary": response.content,
-                "key_points": self._extract_key_points(response.content),
+            analysis = {
+                "summary": content,
+                "key_points": self._extract_key_points(content),
                 "confidence": 0.8  # Would be extracted from LLM response
             }
+            
+            if self._analysis_semantic_cache:
+                self._analysis_semantic_cache.add(vector, {
+                    "sources_digest": sources_digest,
+                    "analysis": analysis
+                })
+            
+            yield analysis
         except Exception as e:
             logger.error(f"Analysis failed: {e}")
-            return {
+            yield {
                 "summary": "Analysis failed",
                 "key_points": [],
                 "confidence": 0.0
             }
     
+    def _count_tokens(self, text: str) -> int:
+        """
+        Count tokens with the model's tokenizer, estimating when unavailable.
+        
+        Args:
+            text: Text to measure
+            
+        Returns:
+            Token count
+        """
+        model_name = getattr(self.llm, "model_name", None) or getattr(self.llm, "model", None)
+        encoding = _get_encoding(model_name if isinstance(model_name, str) else None)
+        if encoding is None:
+            return len(text) // _CHARS_PER_TOKEN + 1
+        return len(encoding.encode(text, disallowed_special=()))
+    
+    def _iter_snippets(
+        self,
+        search_results: List[Dict[str, Any]],
+        budget: int
+    ) -> Iterator[str]:
+        """
+        Yield formatted search results until the token budget is spent.
+        
+        Args:
+            search_results: Ranked search results
+            budget: Maximum tokens to spend on snippets
+            
+        Yields:
+            Formatted snippet per result; the last one is trimmed to fit
+        """
+        for i, result in enumerate(search_results, 1):
+            snippet = (
+                f"\n{i}. Source: {result.get('source', 'Unknown')}\n"
+                f"   Content: {result.get('content', '')}"
+            )
+            tokens = self._count_tokens(snippet)
+            if tokens >= budget:
+                yield snippet[:budget * _CHARS_PER_TOKEN] + "..."
+                return
+            budget -= tokens
+            yield snippet
+    
     def _extract_key_points(self, text: str) -> List[str]:
         """
         Extract key points from text.
@@ -319,23 +817,43 @@ Based on these search results, provide:
             List of key points
         """
         # Simple extraction - in production, use NLP
-        lines = text.split('\n')
-        key_points = []
-        
-        for line in lines:
-            line = line.strip()
-            if line and (
-                line.startswith('-') or
-                line.startswith('•') or
-                line.startswith('*') or
-                (len(line) > 20 and len(line) < 200)
-            ):
-                # Clean up the line
-                if line[0] in ['-', '•', '*']:
-                    line = line[1:].strip()
-                key_points.append(line)
+        points = (m[1] or m[2] for m in _KEY_POINT_RE.finditer(text))
+        return list(dict.fromkeys(p for p in points if p))[:10]  # Limit to top 10 points
+    
+    async def _score_relevance(
+        self,
+        query: str,
+        search_results: List[Dict[str, Any]]
+    ) -> List[float]:
+        """
+        Score how relevant each search result is to the query.
+        
+        Uses cosine similarity from one batched embedding call when
+        embeddings are configured, otherwise BM25 scaled to the best result.
         
-        return key_points[:10]  # Limit to top 10 points
+        Args:
+            query: Original query
+            search_results: Search results
+            
+        Returns:
+            Score per result, in input order
+        """
+        if not search_results:
+            return []
+        
+        if self.embeddings:
+            texts = [query] + [str(r.get("content", ""))[:1024] for r in search_results]
+            try:
+                vectors = np.asarray(await self.embeddings.aembed_documents(texts), dtype=np.float32)
+                norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+                vectors /= np.where(norms == 0, 1, norms)
+                return (vectors[1:] @ vectors[0]).tolist()
+            except Exception as e:
+                logger.warning(f"Relevance embedding failed, using lexical scores: {e}")
+        
+        scores = _bm25_scores(query, search_results)
+        best = max(scores)
+        return [score / best if best else 0.0 for score in scores]
     
     async def _create_report(
         self,
@@ -354,18 +872,23 @@ Based on these search results, provide:
         Returns:
             Research report dictionary
         """
-        # Structure findings
+        # Structure findings, most relevant first
+        results = self._dedup_results(search_results)
+        scores = await self._score_relevance(query, results)
+        ranked = sorted(zip(scores, results), key=lambda pair: -pair[0])[:10]
+        
+        now = utc_now_iso()
         findings = []
-        for result in search_results[:10]:
-            findings.append({
-                "source": result.get("source", "Unknown"),
-                "url": result.get("url"),
-                "title": result.get("title", "Untitled"),
-                "content": result.get("content", "")[:500],
-                "relevance_score": 0.8,  # Would be calculated
-                "timestamp": result.get("timestamp", datetime.utcnow().isoformat()),
-                "metadata": result.get("metadata", {})
-            })
+        for score, result in ranked:
+            findings.append(ResearchResult(
+                source=sys.intern(str(result.get("source", "Unknown"))),
+                url=result.get("url"),
+                title=result.get("title") or "Untitled",
+                content=str(result.get("content", ""))[:500],
+                relevance_score=round(score, 4),
+                timestamp=result.get("timestamp", now),
+                metadata=result.get("metadata") or {}
+            ).model_dump())
         
         # Create report
         report = {
@@ -376,7 +899,11 @@ Based on these search results, provide:
             "recommendations": [],  # Would be generated based on findings
             "sources_count": len(search_results),
             "confidence_score": analysis.get("confidence", 0.5),
-            "generated_at": datetime.utcnow().isoformat()
+            "generated_at": now
         }
         
-        return report
\ No newline at end of file
+        return report
+
+
+# Agent class picked up by AgentRegistry.auto_discover
+AGENT_CLASS = ResearcherAgent
@@ -10,21 +10,40 @@ The Scheduler agent is responsible for:
 - Reminder management
 """
 
-from typing import List, Dict, Any, AsyncIterator, Optional
+from typing import List, Dict, Any, AsyncIterator, Awaitable, Callable, Iterator, Mapping, Optional, ClassVar, FrozenSet, Tuple
+import functools
+import itertools
 import logging
-from datetime import datetime, timedelta
+import re
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
 from enum import Enum
+from types import MappingProxyType
 
-from langchain_core.messages import BaseMessage, HumanMessage
+import numpy as np
+from cachetools import TTLCache
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
 from langchain_core.prompts import ChatPromptTemplate
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 from app.agents.engine.base import (
-    BaseAgent, AgentEvent, AgentRequest, AgentCapability, AgentStatus
+    BaseAgent, AgentEvent, AgentRequest, AgentCapability, AgentStatus, cached_text_block
 )
 
 logger = logging.getLogger(__name__)
 
+@functools.lru_cache(maxsize=32)
+def _slot_date(base_ordinal: int, days_ahead: int) -> str:
+    """Format the date a number of days after a proleptic Gregorian ordinal."""
+    return date.fromordinal(base_ordinal + days_ahead).isoformat()
+
+
+def _to_minutes(time_str: str) -> int:
+    """Convert an "HH:MM" time to minutes after midnight."""
+    hours, minutes = time_str.split(":")
+    return int(hours) * 60 + int(minutes)
+
 
 class ScheduleTask(str, Enum):
     """Types of scheduling tasks."""
@@ -56,8 +75,124 @@ class Priority(str, Enum):
     LOW = "low"
 
 
+# Kept free of template variables so it forms a byte-identical prompt prefix
+_SCHEDULER_SYSTEM_PROMPT = """You are the Scheduler Agent, an expert at time management and calendar optimization.
+
+Your responsibilities:
+1. Schedule meetings and events efficiently
+2. Find optimal time slots for activities
+3. Manage reminders and deadlines
+4. Resolve scheduling conflicts
+5. Optimize calendar for productivity
+
+Scheduling principles:
+- Respect time zones and working hours
+- Consider participant availability
+- Group similar activities when possible
+- Build in buffer time between meetings
+- Protect focus time for deep work
+- Balance meeting load across days
+
+When scheduling:
+1. Check availability and constraints
+2. Find optimal time slots
+3. Consider participant preferences
+4. Avoid conflicts and overlaps
+5. Suggest alternatives when needed"""
+
+_TASKS_STR = ", ".join(task.value for task in ScheduleTask)
+
+
+def _build_scheduler_prompt(system_message: SystemMessage) -> ChatPromptTemplate:
+    """
+    Build the scheduler prompt around a system message.
+    
+    Args:
+        system_message: Leading system message with the scheduling principles
+        
+    Returns:
+        Prompt template taking only the query
+    """
+    return ChatPromptTemplate.from_messages([
+        system_message,
+        SystemMessage(content=f"Available tasks: {_TASKS_STR}\nPriority levels: urgent, high, medium, low"),
+        ("human", "Handle the scheduling request efficiently.\n\n{query}")
+    ])
+
+
+# The prompt is fully static, so both variants are built once at import; the
+# Anthropic one marks the principles as a cacheable prefix
+_SCHEDULER_PROMPT = _build_scheduler_prompt(SystemMessage(content=_SCHEDULER_SYSTEM_PROMPT))
+_SCHEDULER_PROMPT_CACHED = _build_scheduler_prompt(
+    SystemMessage(content=[cached_text_block(_SCHEDULER_SYSTEM_PROMPT)])
+)
+
+# Scheduling keywords, matched case-insensitively in a single scan
+_KEYWORD_RE = re.compile(
+    r"(?P<reschedule>re)?(?P<schedule>schedule)|(?P<meeting>meeting)"
+    r"|(?P<find_time>find time|when can)|(?P<remind>remind)|(?P<cancel>cancel)"
+    r"|(?P<optimize>optimize)|(?P<urgent>urgent|asap)"
+    r"|(?P<high_priority>high priority)|(?P<low_priority>low priority)"
+    r"|(?P<two_hours>(?:2|two) hour)|(?P<half_hour>half hour)|(?P<hour>hour)"
+    r"|(?P<min_15>15 min)|(?P<min_45>45 min)",
+    re.IGNORECASE
+)
+
+# Keyword rules in precedence order
+_TASK_RULES = (
+    (frozenset({"schedule", "meeting"}), ScheduleTask.SCHEDULE_MEETING),
+    (frozenset({"find_time"}), ScheduleTask.FIND_TIME),
+    (frozenset({"remind"}), ScheduleTask.SET_REMINDER),
+    (frozenset({"reschedule"}), ScheduleTask.RESCHEDULE),
+    (frozenset({"cancel"}), ScheduleTask.CANCEL),
+    (frozenset({"optimize"}), ScheduleTask.OPTIMIZE_CALENDAR),
+)
+_PRIORITY_RULES = (
+    (frozenset({"urgent"}), Priority.URGENT),
+    (frozenset({"high_priority"}), Priority.HIGH),
+    (frozenset({"low_priority"}), Priority.LOW),
+)
+_DURATION_RULES = (
+    (frozenset({"two_hours"}), 120),
+    (frozenset({"half_hour"}), 30),
+    (frozenset({"hour"}), 60),
+    (frozenset({"min_15"}), 15),
+    (frozenset({"min_45"}), 45),
+)
+
+
+# Static advice shared by every result
+_TIPS_NO_SLOT = ("Consider reducing meeting frequency", "Try async communication")
+_TIPS_SCHEDULED = ("Block focus time before/after meetings", "Consider batching similar meetings")
+_TIPS_FIND_TIME = ("Morning slots tend to have higher productivity", "Avoid back-to-back meetings when possible")
+_TIPS_REMINDER = ("Set reminders for important deadlines", "Use recurring reminders for habits")
+_CALENDAR_OPTIMIZATIONS = (
+    "Batch similar meetings on same days",
+    "Create 'No Meeting' blocks for deep work",
+    "Add buffer time between back-to-back meetings",
+    "Move low-priority meetings to less productive hours",
+    "Convert some meetings to async communication"
+)
+_ALTERNATIVE_SUGGESTIONS = (
+    MappingProxyType({
+        "option": "Split into multiple shorter meetings",
+        "benefit": "Better engagement and retention"
+    }),
+    MappingProxyType({
+        "option": "Convert to async discussion",
+        "benefit": "More flexible participation"
+    }),
+    MappingProxyType({
+        "option": "Schedule for next week",
+        "benefit": "More availability options"
+    })
+)
+
+
 class ScheduleRequest(BaseModel):
     """Represents a scheduling request."""
+    model_config = ConfigDict(frozen=True)
+    
     task: ScheduleTask = Field(..., description="Type of scheduling task")
     event_type: EventType = Field(default=EventType.MEETING, description="Type of event")
     title: str = Field(..., description="Event title")
@@ -72,6 +207,8 @@ class ScheduleRequest(BaseModel):
 
 class ScheduleResult(BaseModel):
     """Scheduling operation result."""
+    model_config = ConfigDict(frozen=True)
+    
     success: bool = Field(..., description="Whether scheduling succeeded")
     event_id: Optional[str] = Field(None, description="Created event ID")
     scheduled_time: Optional[str] = Field(None, description="Scheduled time")
@@ -82,6 +219,138 @@ class ScheduleResult(BaseModel):
     optimization_tips: List[str] = Field(default_factory=list, description="Calendar optimization suggestions")
 
 
+@functools.lru_cache(maxsize=4096)
+def _parse_schedule_request(query: str) -> ScheduleRequest:
+    """
+    Parse a scheduling request.
+    
+    Parsing depends only on the query text, so results are cached and
+    repeated queries (retries, scheduled runs) skip the scan entirely.
+    
+    Args:
+        query: User's request
+        
+    Returns:
+        Structured schedule request
+    """
+    # Collect every keyword in one pass; "reschedule" also counts as "schedule"
+    found = set()
+    for match in _KEYWORD_RE.finditer(query):
+        found.add(match.lastgroup)
+        if match["reschedule"]:
+            found.add("reschedule")
+    
+    # The first rule whose keywords all appear wins
+    task = next(
+        (value for keys, value in _TASK_RULES if keys <= found),
+        ScheduleTask.SCHEDULE_MEETING
+    )
+    priority = next(
+        (value for keys, value in _PRIORITY_RULES if keys <= found),
+        Priority.MEDIUM
+    )
+    duration = next(
+        (value for keys, value in _DURATION_RULES if keys <= found),
+        30  # Default 30 minutes
+    )
+    
+    return ScheduleRequest(
+        task=task,
+        title=query[:50],  # Use first 50 chars as title
+        duration=duration,
+        priority=priority
+    )
+
+
+@dataclass(slots=True, frozen=True)
+class _CalEvent:
+    """A booked calendar event."""
+    id: str
+    title: str
+    time: str
+    duration: int
+    priority: Priority
+    participants: Tuple[str, ...]
+
+
+class _DaySchedule:
+    """
+    Events booked on one day.
+    
+    Each event's start and end minutes are packed as an int16 pair in one
+    contiguous (capacity, 2) buffer, so an overlap check is two vectorized
+    comparisons over a flat block of memory (numpy lowers them to SIMD);
+    the event records themselves are only touched for actual conflicts.
+    """
+    
+    __slots__ = ("spans", "events")
+    
+    def __init__(self, capacity: int = 8):
+        self.spans = np.empty((capacity, 2), dtype=np.int16)
+        self.events: List[_CalEvent] = []
+    
+    def __len__(self) -> int:
+        return len(self.events)
+    
+    def add(self, event: _CalEvent, start_min: int, end_min: int) -> None:
+        """
+        Book an event.
+        
+        Args:
+            event: Event record
+            start_min: Start in minutes after midnight
+            end_min: End in minutes after midnight (exclusive)
+        """
+        size = len(self.events)
+        if size == len(self.spans):
+            # Double the buffer so appends stay amortized O(1)
+            self.spans = np.resize(self.spans, (size * 2, 2))
+        
+        self.spans[size] = (start_min, end_min)
+        self.events.append(event)
+    
+    def overlapping(self, start_min: int, end_min: int) -> List[_CalEvent]:
+        """
+        Find events overlapping a time window.
+        
+        Args:
+            start_min: Window start in minutes after midnight
+            end_min: Window end in minutes after midnight (exclusive)
+            
+        Returns:
+            Overlapping events in booking order
+        """
+        spans = self.spans[:len(self.events)]
+        mask = (spans[:, 0] < end_min) & (spans[:, 1] > start_min)
+        return [self.events[i] for i in np.flatnonzero(mask)]
+
+
+def _cached_advice(key: Callable[[ScheduleRequest], Tuple]):
+    """
+    Cache an advice method's result on fields of the parsed request.
+    
+    Keying on the structured request rather than the raw query lets
+    paraphrases of the same ask share one (eventually LLM-generated) answer.
+    
+    Args:
+        key: Maps a schedule request to the fields the advice depends on
+        
+    Returns:
+        Decorator for async methods taking a single ``ScheduleRequest``
+    """
+    def decorator(method: Callable[..., Awaitable[Any]]):
+        @functools.wraps(method)
+        async def wrapper(self, request: ScheduleRequest):
+            cache_key = (method.__name__, *key(request))
+            cached = self._advice_cache.get(cache_key)
+            if cached is None:
+                cached = await method(self, request)
+                self._advice_cache[cache_key] = cached
+            return cached
+        return wrapper
+    return decorator
+
+
 class SchedulerAgent(BaseAgent):
     """
     Scheduler Agent - The time management specialist of the Syna system.
@@ -94,50 +363,48 @@ class SchedulerAgent(BaseAgent):
     - Schedule conflict resolution
     """
     
+    CAPABILITIES: ClassVar[FrozenSet[AgentCapability]] = frozenset({
+        AgentCapability.SCHEDULING,
+        AgentCapability.PLANNING,
+        AgentCapability.MEMORY_ACCESS
+    })
+    
+    # Sample free slots as (days ahead, time, quality): mornings are the
+    # most productive, and evening slots are only offered for the next two days
+    _SLOT_TEMPLATE: ClassVar[Tuple[Tuple[int, str, str], ...]] = (
+        (0, "09:00", "high"), (0, "14:00", "medium"), (0, "16:30", "low"),
+        (1, "09:00", "high"), (1, "14:00", "medium"), (1, "16:30", "low"),
+        (2, "09:00", "high"), (2, "14:00", "medium"),
+        (3, "09:00", "high"), (3, "14:00", "medium"),
+    )
+    
+    # Event and reminder ids are the process start epoch plus a sequence
+    # number: unique within the process without a clock read per id
+    _id_epoch: ClassVar[int] = int(time.time())
+    _id_counter: ClassVar[Iterator[int]] = itertools.count()
+    
     def _initialize(self) -> None:
         """Initialize scheduler-specific components."""
-        self.capabilities = [
-            AgentCapability.SCHEDULING,
-            AgentCapability.PLANNING,
-            AgentCapability.MEMORY_ACCESS
-        ]
-        
         # Mock calendar data
-        self.calendar: Dict[str, List[Dict[str, Any]]] = {}
+        self.calendar: Dict[str, _DaySchedule] = {}
         self.reminders: List[Dict[str, Any]] = []
         
+        # Advice keyed by the parsed request, see _cached_advice
+        self._advice_cache: TTLCache = TTLCache(
+            maxsize=self.config.get("advice_cache_size", 256),
+            ttl=self.config.get("advice_cache_ttl", 3600)
+        )
+        
     def _create_prompt(self) -> ChatPromptTemplate:
-        """Create the scheduler's prompt template."""
-        return ChatPromptTemplate.from_messages([
-            ("system", """You are the Scheduler Agent, an expert at time management and calendar optimization.
-
-Your responsibilities:
-1. Schedule meetings and events efficiently
-2. Find optimal time slots for activities
-3. Manage reminders and deadlines
-4. Resolve scheduling conflicts
-5. Optimize calendar for productivity
-
-Scheduling principles:
-- Respect time zones and working hours
-- Consider participant availability
-- Group similar activities when possible
-- Build in buffer time between meetings
-- Protect focus time for deep work
-- Balance meeting load across days
-
-Available tasks: {tasks}
-Priority levels: urgent, high, medium, low
-
-When scheduling:
-1. Check availability and constraints
-2. Find optimal time slots
-3. Consider participant preferences
-4. Avoid conflicts and overlaps
-5. Suggest alternatives when needed"""),
-            ("human", "{query}"),
-            ("system", "Handle the scheduling request efficiently.")
-        ])
+        """
+        Create the scheduler's prompt template.
+        
+        The template is static and shared across instances; Anthropic models
+        get the variant whose principles are marked cacheable.
+        """
+        if self.supports_prompt_caching():
+            return _SCHEDULER_PROMPT_CACHED
+        return _SCHEDULER_PROMPT
     
     async def _execute_core(
         self,
@@ -157,6 +424,11 @@ When scheduling:
         try:
             # Update status
             self.status = AgentStatus.EXECUTING
+            
+            # One clock reading for every comparison in this request
+            now = datetime.utcnow()
+            today_key = now.strftime("%Y-%m-%d")
+            
             yield self._create_event("scheduling_started", {
                 "query": request.query
             })
@@ -165,10 +437,10 @@ When scheduling:
             schedule_request = self._parse_schedule_request(request.query)
             
             yield self._create_event("request_parsed", {
-                "task": schedule_request.task.value,
-                "event_type": schedule_request.event_type.value,
+                "task": schedule_request.task,
+                "event_type": schedule_request.event_type,
                 "duration": schedule_request.duration,
-                "priority": schedule_request.priority.value
+                "priority": schedule_request.priority
             })
             
             # Phase 1: Check availability
@@ -177,20 +449,33 @@ When scheduling:
                 "message": "Checking calendar availability..."
             })
             
-            availability = await self._check_availability(schedule_request)
+            availability = await self._check_availability(
+                schedule_request, now=now, today_key=today_key
+            )
             
             if not availability["available"]:
                 yield self._create_event("conflicts_found", {
                     "conflicts": availability["conflicts"]
                 })
             
+            # Let clients render each phase's outcome before the full result
+            yield self._create_event("partial_result", {
+                "conflicts": availability["conflicts"]
+            })
+            
             # Phase 2: Find optimal time
             yield self._create_event("phase", {
                 "phase": "optimization",
                 "message": "Finding optimal time slot..."
             })
             
-            optimal_slot = await self._find_optimal_slot(schedule_request, availability)
+            optimal_slot = await self._find_optimal_slot(
+                schedule_request, availability, today_key=today_key
+            )
+            
+            yield self._create_event("partial_result", {
+                "optimal_slot": optimal_slot
+            })
             
             # Phase 3: Schedule event
             yield self._create_event("phase", {
@@ -198,30 +483,34 @@ When scheduling:
                 "message": "Creating calendar event..."
             })
             
-            # Execute based on task type
-            if schedule_request.task == ScheduleTask.SCHEDULE_MEETING:
-                result = await self._schedule_meeting(schedule_request, optimal_slot)
-            elif schedule_request.task == ScheduleTask.FIND_TIME:
-                result = await self._find_time(schedule_request)
-            elif schedule_request.task == ScheduleTask.SET_REMINDER:
-                result = await self._set_reminder(schedule_request)
-            elif schedule_request.task == ScheduleTask.OPTIMIZE_CALENDAR:
+            # Execute based on task type; enum members are singletons
+            task = schedule_request.task
+            if task is ScheduleTask.SCHEDULE_MEETING:
+                result = await self._schedule_meeting(schedule_request, optimal_slot, now=now)
+            elif task is ScheduleTask.FIND_TIME:
+                result = await self._find_time(schedule_request, now=now, today_key=today_key)
+            elif task is ScheduleTask.SET_REMINDER:
+                result = await self._set_reminder(schedule_request, now=now)
+            elif task is ScheduleTask.OPTIMIZE_CALENDAR:
                 result = await self._optimize_calendar(schedule_request)
             else:
-                result = await self._general_scheduling(schedule_request, optimal_slot)
+                result = await self._general_scheduling(schedule_request, optimal_slot, now=now)
+            
+            # Dump once and share the payload between the event and the context
+            payload = result.model_dump()
             
             # Emit the result
             yield self._create_event("scheduling_complete", {
-                "result": result.dict(),
+                "result": payload,
                 "success": result.success
             })
             
             # Store in context
             if request.context:
-                request.context.metadata["schedule_result"] = result.dict()
+                request.context.metadata["schedule_result"] = payload
             
         except Exception as e:
-            logger.error(f"Scheduling failed: {e}", exc_info=True)
+            logger.error("Scheduling failed: %s", e, exc_info=logger.isEnabledFor(logging.DEBUG))
             yield self._create_event("scheduling_failed", {
                 "error": str(e)
             })
@@ -235,91 +524,75 @@ When scheduling:
             query: User's request
             
         Returns:
-            Structured schedule request
-        """
-        query_lower = query.lower()
-        
-        # Detect task type
-        if "schedule" in query_lower and "meeting" in query_lower:
-            task = ScheduleTask.SCHEDULE_MEETING
-        elif "find time" in query_lower or "when can" in query_lower:
-            task = ScheduleTask.FIND_TIME
-        elif "remind" in query_lower:
-            task = ScheduleTask.SET_REMINDER
-        elif "reschedule" in query_lower:
-            task = ScheduleTask.RESCHEDULE
-        elif "cancel" in query_lower:
-            task = ScheduleTask.CANCEL
-        elif "optimize" in query_lower:
-            task = ScheduleTask.OPTIMIZE_CALENDAR
-        else:
-            task = ScheduleTask.SCHEDULE_MEETING
-        
-        # Detect priority
-        priority = Priority.MEDIUM
-        if "urgent" in query_lower or "asap" in query_lower:
-            priority = Priority.URGENT
-        elif "high priority" in query_lower:
-            priority = Priority.HIGH
-        elif "low priority" in query_lower:
-            priority = Priority.LOW
-        
-        # Detect duration
-        duration = 30  # Default 30 minutes
-        if "hour" in query_lower:
-            if "2 hour" in query_lower or "two hour" in query_lower:
-                duration = 120
-            elif "half hour" in query_lower:
-                duration = 30
-            else:
-                duration = 60
-        elif "15 min" in query_lower:
-            duration = 15
-        elif "45 min" in query_lower:
-            duration = 45
-        
-        return ScheduleRequest(
-            task=task,
-            title=query[:50],  # Use first 50 chars as title
-            duration=duration,
-            priority=priority
-        )
+            Structured schedule request, shared between identical queries
+        """
+        return _parse_schedule_request(query)
     
     async def _check_availability(
         self,
-        request: ScheduleRequest
+        request: ScheduleRequest,
+        *,
+        now: datetime,
+        today_key: str
     ) -> Dict[str, Any]:
         """
         Check calendar availability.
         
         Args:
             request: Schedule request
+            now: Reference time for the request
+            today_key: ``now`` as YYYY-MM-DD
             
         Returns:
             Availability information
         """
-        # Simulate availability check
-        now = datetime.utcnow()
-        conflicts = []
-        
-        # Check for conflicts in mock calendar
-        date_key = now.strftime("%Y-%m-%d")
-        if date_key in self.calendar:
-            existing_events = self.calendar[date_key]
-            for event in existing_events:
-                # Simple overlap check
-                conflicts.append({
-                    "event": event["title"],
-                    "time": event["time"],
-                    "duration": event.get("duration", 30)
-                })
+        # Simulate availability check for a window starting now
+        start_min = now.hour * 60 + now.minute
+        
+        conflicts = [
+            {
+                "event": event.title,
+                "time": event.time,
+                "duration": event.duration
+            }
+            for event in self._find_conflicts(today_key, start_min, start_min + request.duration)
+        ]
+        
+        # Drop candidate slots that overlap booked events
+        free_slots = []
+        for slot in self._find_free_slots(now, request.duration):
+            slot_start = _to_minutes(slot["time"])
+            if not self._find_conflicts(slot["date"], slot_start, slot_start + request.duration):
+                free_slots.append(slot)
         
         return {
             "available": len(conflicts) == 0,
             "conflicts": conflicts,
-            "free_slots": self._find_free_slots(now, request.duration)
+            "free_slots": free_slots
         }
     
+    def _find_conflicts(
+        self,
+        date_key: str,
+        start_min: int,
+        end_min: int
+    ) -> List[_CalEvent]:
+        """
+        Find events on a day that overlap a time window.
+        
+        Args:
+            date_key: Day as YYYY-MM-DD
+            start_min: Window start in minutes after midnight
+            end_min: Window end in minutes after midnight (exclusive)
+            
+        Returns:
+            Overlapping events
+        """
+        day = self.calendar.get(date_key)
+        if not day:
+            return []
+        return day.overlapping(start_min, end_min)
+    
     def _find_free_slots(
         self,
         start_date: datetime,
@@ -335,87 +608,64 @@ When scheduling:
         Returns:
             List of free slots
         """
-        free_slots = []
-        
-        # Generate sample free slots
-        for day in range(5):  # Next 5 days
-            date = start_date + timedelta(days=day)
-            
-            # Morning slots
-            free_slots.append({
-                "date": date.strftime("%Y-%m-%d"),
-                "time": "09:00",
-                "duration": duration,
-                "quality": "high"  # Morning = high quality
-            })
-            
-            # Afternoon slots
-            free_slots.append({
-                "date": date.strftime("%Y-%m-%d"),
-                "time": "14:00",
+        base = start_date.toordinal()
+        return [
+            {
+                "date": _slot_date(base, day),
+                "time": time,
                 "duration": duration,
-                "quality": "medium"
-            })
-            
-            if day < 2:  # Only show evening slots for next 2 days
-                free_slots.append({
-                    "date": date.strftime("%Y-%m-%d"),
-                    "time": "16:30",
-                    "duration": duration,
-                    "quality": "low"
-                })
-        
-        return free_slots[:10]  # Return max 10 slots
+                "quality": quality
+            }
+            for day, time, quality in self._SLOT_TEMPLATE
+        ]
     
     async def _find_optimal_slot(
         self,
         request: ScheduleRequest,
-        availability: Dict[str, Any]
-    ) -> Dict[str, Any]:
+        availability: Dict[str, Any],
+        *,
+        today_key: str
+    ) -> Optional[Dict[str, Any]]:
         """
         Find the optimal time slot.
         
         Args:
             request: Schedule request
             availability: Availability information
+            today_key: Today's date as YYYY-MM-DD
             
         Returns:
             Optimal slot information
         """
         free_slots = availability.get("free_slots", [])
         
-        if not free_slots:
-            return None
+        urgent = request.priority is Priority.URGENT
         
-        # Score slots based on various factors
-        scored_slots = []
-        for slot in free_slots:
-            score = 0
+        def score(slot: Dict[str, Any]) -> int:
+            """Score a slot based on various factors."""
+            value = 0
             
-            # Priority bonus
-            if request.priority == Priority.URGENT:
-                # Prefer earlier slots for urgent items
-                if slot["date"] == datetime.utcnow().strftime("%Y-%m-%d"):
-                    score += 10
+            # Priority bonus: prefer earlier slots for urgent items
+            if urgent and slot["date"] == today_key:
+                value += 10
             
             # Quality score
             if slot["quality"] == "high":
-                score += 5
+                value += 5
             elif slot["quality"] == "medium":
-                score += 3
+                value += 3
             
-            # Add score to slot
-            slot["score"] = score
-            scored_slots.append(slot)
+            return value
         
-        # Sort by score and return best
-        scored_slots.sort(key=lambda x: x["score"], reverse=True)
-        return scored_slots[0] if scored_slots else None
+        # Only the best slot is needed; ties go to the earliest slot
+        return max(free_slots, key=score, default=None)
     
     async def _schedule_meeting(
         self,
         request: ScheduleRequest,
-        optimal_slot: Optional[Dict[str, Any]]
+        optimal_slot: Optional[Dict[str, Any]],
+        *,
+        now: datetime
     ) -> ScheduleResult:
         """
         Schedule a meeting.
@@ -423,6 +673,7 @@ When scheduling:
         Args:
             request: Schedule request
             optimal_slot: Optimal time slot
+            now: Reference time for the request
             
         Returns:
             Schedule result
@@ -432,26 +683,28 @@ When scheduling:
                 success=False,
                 duration=request.duration,
                 suggestions=await self._get_alternative_suggestions(request),
-                optimization_tips=["Consider reducing meeting frequency", "Try async communication"]
+                optimization_tips=_TIPS_NO_SLOT
             )
         
         # Create event
-        event_id = f"evt_{datetime.utcnow().timestamp()}"
+        event_id = f"evt_{self._id_epoch}_{next(self._id_counter)}"
         scheduled_time = f"{optimal_slot['date']} {optimal_slot['time']}"
         
         # Add to calendar
         date_key = optimal_slot["date"]
-        if date_key not in self.calendar:
-            self.calendar[date_key] = []
-        
-        self.calendar[date_key].append({
-            "id": event_id,
-            "title": request.title,
-            "time": optimal_slot["time"],
-            "duration": request.duration,
-            "priority": request.priority.value,
-            "participants": request.participants
-        })
+        day = self.calendar.get(date_key)
+        if day is None:
+            day = self.calendar[date_key] = _DaySchedule()
+        
+        start_min = _to_minutes(optimal_slot["time"])
+        day.add(_CalEvent(
+            id=event_id,
+            title=request.title,
+            time=optimal_slot["time"],
+            duration=request.duration,
+            priority=request.priority,
+            participants=tuple(request.participants)
+        ), start_min, start_min + request.duration)
         
         return ScheduleResult(
             success=True,
@@ -461,26 +714,32 @@ When scheduling:
             conflicts=[],
             suggestions=[],
             calendar_summary={
-                "total_events_today": len(self.calendar.get(date_key, [])),
-                "next_available": self._get_next_available_slot()
+                # The day's event list is its running count
+                "total_events_today": len(day),
+                "next_available": self._get_next_available_slot(now)
             },
-            optimization_tips=[
-                "Block focus time before/after meetings",
-                "Consider batching similar meetings"
-            ]
+            optimization_tips=_TIPS_SCHEDULED
         )
     
-    async def _find_time(self, request: ScheduleRequest) -> ScheduleResult:
+    async def _find_time(
+        self,
+        request: ScheduleRequest,
+        *,
+        now: datetime,
+        today_key: str
+    ) -> ScheduleResult:
         """
         Find available time slots.
         
         Args:
             request: Schedule request
+            now: Reference time for the request
+            today_key: ``now`` as YYYY-MM-DD
             
         Returns:
             Available times
         """
-        availability = await self._check_availability(request)
+        availability = await self._check_availability(request, now=now, today_key=today_key)
         free_slots = availability.get("free_slots", [])
         
         return ScheduleResult(
@@ -497,45 +756,42 @@ When scheduling:
             calendar_summary={
                 "free_slots_found": len(free_slots)
             },
-            optimization_tips=[
-                "Morning slots tend to have higher productivity",
-                "Avoid back-to-back meetings when possible"
-            ]
+            optimization_tips=_TIPS_FIND_TIME
         )
     
-    async def _set_reminder(self, request: ScheduleRequest) -> ScheduleResult:
+    async def _set_reminder(self, request: ScheduleRequest, *, now: datetime) -> ScheduleResult:
         """
         Set a reminder.
         
         Args:
             request: Schedule request
+            now: Reference time for the request
             
         Returns:
             Reminder result
         """
-        reminder_id = f"rem_{datetime.utcnow().timestamp()}"
+        reminder_id = f"rem_{self._id_epoch}_{next(self._id_counter)}"
+        remind_at = now + timedelta(hours=1)  # Default 1 hour from now
         
         self.reminders.append({
             "id": reminder_id,
             "title": request.title,
-            "time": datetime.utcnow() + timedelta(hours=1),  # Default 1 hour from now
-            "priority": request.priority.value
+            "time": remind_at,
+            "priority": request.priority
         })
         
         return ScheduleResult(
             success=True,
             event_id=reminder_id,
-            scheduled_time=(datetime.utcnow() + timedelta(hours=1)).isoformat(),
+            scheduled_time=remind_at.isoformat(),
             duration=0,
             calendar_summary={
                 "active_reminders": len(self.reminders)
             },
-            optimization_tips=[
-                "Set reminders for important deadlines",
-                "Use recurring reminders for habits"
-            ]
+            optimization_tips=_TIPS_REMINDER
         )
     
+    @_cached_advice(key=lambda request: (request.task, request.priority, request.duration))
     async def _optimize_calendar(self, request: ScheduleRequest) -> ScheduleResult:
         """
         Optimize calendar schedule.
@@ -546,14 +802,6 @@ When scheduling:
         Returns:
             Optimization results
         """
-        optimizations = [
-            "Batch similar meetings on same days",
-            "Create 'No Meeting' blocks for deep work",
-            "Add buffer time between back-to-back meetings",
-            "Move low-priority meetings to less productive hours",
-            "Convert some meetings to async communication"
-        ]
-        
         return ScheduleResult(
             success=True,
             duration=0,
@@ -562,13 +810,15 @@ When scheduling:
                 "average_daily_meetings": 3,
                 "focus_time_available": "40%"
             },
-            optimization_tips=optimizations
+            optimization_tips=_CALENDAR_OPTIMIZATIONS
         )
     
     async def _general_scheduling(
         self,
         request: ScheduleRequest,
-        optimal_slot: Optional[Dict[str, Any]]
+        optimal_slot: Optional[Dict[str, Any]],
+        *,
+        now: datetime
     ) -> ScheduleResult:
         """
         Handle general scheduling requests.
@@ -576,16 +826,18 @@ When scheduling:
         Args:
             request: Schedule request
             optimal_slot: Optimal slot
+            now: Reference time for the request
             
         Returns:
             Schedule result
         """
-        return await self._schedule_meeting(request, optimal_slot)
+        return await self._schedule_meeting(request, optimal_slot, now=now)
     
+    @_cached_advice(key=lambda request: (request.task, request.priority, request.duration))
     async def _get_alternative_suggestions(
         self,
         request: ScheduleRequest
-    ) -> List[Dict[str, Any]]:
+    ) -> Tuple[Mapping[str, str], ...]:
         """
         Get alternative scheduling suggestions.
         
@@ -595,28 +847,22 @@ When scheduling:
         Returns:
             Alternative suggestions
         """
-        return [
-            {
-                "option": "Split into multiple shorter meetings",
-                "benefit": "Better engagement and retention"
-            },
-            {
-                "option": "Convert to async discussion",
-                "benefit": "More flexible participation"
-            },
-            {
-                "option": "Schedule for next week",
-                "benefit": "More availability options"
-            }
-        ]
+        return _ALTERNATIVE_SUGGESTIONS
     
-    def _get_next_available_slot(self) -> str:
+    def _get_next_available_slot(self, now: datetime) -> str:
         """
         Get the next available time slot.
         
+        Args:
+            now: Reference time for the request
+            
         Returns:
             Next available slot description
         """
         # Simple mock implementation
-        next_slot = datetime.utcnow() + timedelta(hours=2)
-        return next_slot.strftime("%Y-%m-%d %H:%M")
\ No newline at end of file
+        next_slot = now + timedelta(hours=2)
+        return next_slot.strftime("%Y-%m-%d %H:%M")
+
+
+# Agent class picked up by AgentRegistry.auto_discover
+AGENT_CLASS = SchedulerAgent
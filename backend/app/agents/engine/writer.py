@@ -8,18 +8,27 @@ The Writer agent is responsible for:
 - Maintaining consistent tone and style
 """
 
-from typing import List, Dict, Any, AsyncIterator, Optional
+from typing import List, Dict, Any, AsyncIterator, Optional, ClassVar, FrozenSet, Sequence, Tuple, Union
+import asyncio
+import hashlib
 import logging
-from datetime import datetime
+import re
+import weakref
 from enum import Enum
 
-from langchain_core.messages import BaseMessage, HumanMessage
-from langchain_core.prompts import ChatPromptTemplate
-from pydantic import BaseModel, Field
+import numpy as np
+from cachetools import TTLCache
+from langchain_core.messages import BaseMessage, SystemMessage
+from langchain_core.prompts import ChatPromptTemplate, HumanMessagePromptTemplate
+from pydantic import BaseModel, ConfigDict, Field
 
 from app.agents.engine.base import (
-    BaseAgent, AgentEvent, AgentRequest, AgentCapability, AgentStatus
+    BaseAgent, AgentEvent, AgentRequest, AgentCapability, AgentStatus,
+    cached_text_block, utc_now_iso
 )
+from app.config import settings
+from app.core.redis_manager import redis_manager
+from app.core.semantic_cache import SemanticCache
 
 logger = logging.getLogger(__name__)
 
@@ -48,8 +57,132 @@ class DocumentType(str, Enum):
     USER_GUIDE = "user_guide"
 
 
+# Baked into the system prompt so it is byte-identical on every call
+_STYLES_STR = ", ".join(style.value for style in WritingStyle)
+_DOC_TYPES_STR = ", ".join(doc_type.value for doc_type in DocumentType)
+
+_WRITER_SYSTEM_PROMPT = f"""You are the Writer Agent, an expert at creating high-quality written content.
+
+Your responsibilities:
+1. Create clear, engaging, and well-structured content
+2. Adapt writing style to match the audience and purpose
+3. Ensure accuracy and consistency throughout documents
+4. Format content appropriately for the medium
+5. Edit and refine text for clarity and impact
+
+Writing principles:
+- Know your audience and write for them
+- Start with a clear structure and outline
+- Use appropriate tone and vocabulary
+- Include relevant examples and evidence
+- Ensure logical flow between sections
+- Proofread for grammar and clarity
+
+Available writing styles: {_STYLES_STR}
+Document types you can create: {_DOC_TYPES_STR}
+
+When writing:
+1. Understand the requirements and constraints
+2. Research the topic if needed
+3. Create an outline or structure
+4. Write clear, concise content
+5. Review and refine the output"""
+
+# Document types short enough for the short-form model, when one is configured
+_SHORT_FORM_TYPES = frozenset({DocumentType.EMAIL, DocumentType.README, DocumentType.BLOG_POST})
+
+# Standard outlines per document type, shared read-only by every request
+_OUTLINES: Dict[DocumentType, Tuple[str, ...]] = {
+    DocumentType.REPORT: (
+        "Executive Summary",
+        "Introduction",
+        "Methodology",
+        "Findings",
+        "Analysis",
+        "Recommendations",
+        "Conclusion"
+    ),
+    DocumentType.ARTICLE: (
+        "Introduction",
+        "Main Points",
+        "Supporting Evidence",
+        "Conclusion"
+    ),
+    DocumentType.DOCUMENTATION: (
+        "Overview",
+        "Getting Started",
+        "Features",
+        "Usage",
+        "Examples",
+        "API Reference",
+        "Troubleshooting"
+    ),
+    DocumentType.PROPOSAL: (
+        "Executive Summary",
+        "Problem Statement",
+        "Proposed Solution",
+        "Implementation Plan",
+        "Timeline",
+        "Budget",
+        "Conclusion"
+    )
+}
+_DEFAULT_OUTLINE = ("Introduction", "Main Content", "Conclusion")
+
+# Whitespace runs, and any whitespace that is not already a single space
+_WS_RE = re.compile(r"\s+")
+_UNNORMALIZED_WS_RE = re.compile(r"\s{2,}|[^\S ]")
+
+# Query keywords in priority order: the first listed keyword found wins
+_DOC_TYPE_KEYWORDS: Dict[str, DocumentType] = {
+    doc_type.value.replace("_", " "): doc_type for doc_type in DocumentType
+}
+_STYLE_KEYWORDS: Dict[str, WritingStyle] = {
+    "technical": WritingStyle.TECHNICAL,
+    "creative": WritingStyle.CREATIVE,
+    "academic": WritingStyle.ACADEMIC,
+    "marketing": WritingStyle.MARKETING,
+    "sales": WritingStyle.MARKETING
+}
+
+
+def _keyword_re(keywords: Dict[str, Any]) -> re.Pattern[str]:
+    """Compile an alternation that reports every keyword occurrence, overlaps included."""
+    return re.compile("(?=(" + "|".join(map(re.escape, keywords)) + "))")
+
+
+_DOC_TYPE_RE = _keyword_re(_DOC_TYPE_KEYWORDS)
+_STYLE_RE = _keyword_re(_STYLE_KEYWORDS)
+
+
+def _first_keyword_match(
+    pattern: re.Pattern[str],
+    keywords: Dict[str, Any],
+    text: str,
+    default: Any
+) -> Any:
+    """
+    Find the highest-priority keyword in a text.
+    
+    Args:
+        pattern: Alternation built by ``_keyword_re`` over ``keywords``
+        keywords: Keyword to value mapping in priority order
+        text: Lowercased text to scan
+        default: Value when no keyword occurs
+        
+    Returns:
+        Value of the first keyword in ``keywords`` that occurs in ``text``
+    """
+    found = {match.group(1) for match in pattern.finditer(text)}
+    if not found:
+        return default
+    return next(value for keyword, value in keywords.items() if keyword in found)
+
+
 class WritingTask(BaseModel):
     """Represents a writing task."""
+    model_config = ConfigDict(frozen=True)
+    
     type: DocumentType = Field(..., description="Type of document")
     topic: str = Field(..., description="Topic or subject")
     audience: str = Field(..., description="Target audience")
@@ -71,6 +204,34 @@ class WrittenContent(BaseModel):
     reading_time: int = Field(..., description="Estimated reading time in minutes")
 
 
+_MAX_RETRY_DELAY = 30.0
+
+
+def _rate_limit_delay(error: Exception, attempt: int) -> Optional[float]:
+    """
+    Work out how long to wait before retrying a rate-limited LLM call.
+    
+    Args:
+        error: Error raised by the LLM client
+        attempt: Zero-based attempt number
+        
+    Returns:
+        Seconds to wait, or None if the error is not a rate limit
+    """
+    if getattr(error, "status_code", None) != 429:
+        return None
+    
+    # Honour the provider's retry-after header, else back off exponentially;
+    # either way the wait is capped so one request cannot stall indefinitely
+    response = getattr(error, "response", None)
+    retry_after = response.headers.get("retry-after") if response is not None else None
+    try:
+        delay = float(retry_after)
+    except (TypeError, ValueError):
+        delay = float(2 ** attempt)
+    return min(max(delay, 0.0), _MAX_RETRY_DELAY)
+
+
 class WriterAgent(BaseAgent):
     """
     Writer Agent - The content creation specialist of the Syna system.
@@ -82,48 +243,80 @@ class WriterAgent(BaseAgent):
     - Creating various types of written materials
     """
     
+    CAPABILITIES: ClassVar[FrozenSet[AgentCapability]] = frozenset({
+        AgentCapability.WRITING,
+        AgentCapability.REVIEW,
+        AgentCapability.ANALYSIS
+    })
+    
+    # Caps concurrent LLM calls across all writer instances in the process,
+    # keeping bursts under the provider's rate limits; one semaphore per
+    # event loop, created on first use
+    _LLM_SEMAPHORES: ClassVar["weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]"] = (
+        weakref.WeakKeyDictionary()
+    )
+    
+    @classmethod
+    def _llm_semaphore(cls) -> asyncio.Semaphore:
+        """Get the writer LLM concurrency cap for the running event loop."""
+        loop = asyncio.get_running_loop()
+        semaphore = cls._LLM_SEMAPHORES.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(settings.writer_llm_concurrency)
+            cls._LLM_SEMAPHORES[loop] = semaphore
+        return semaphore
+    
     def _initialize(self) -> None:
         """Initialize writer-specific components."""
-        self.capabilities = [
-            AgentCapability.WRITING,
-            AgentCapability.REVIEW,
-            AgentCapability.ANALYSIS
-        ]
-        
         # Writing context cache
         self.context_cache: Dict[str, Any] = {}
         
-    def _create_prompt(self) -> ChatPromptTemplate:
-        """Create the writer's prompt template."""
-        return ChatPromptTemplate.from_messages([
-            ("system", """You are the Writer Agent, an expert at creating high-quality written content.
-
-Your responsibilities:
-1. Create clear, engaging, and well-structured content
-2. Adapt writing style to match the audience and purpose
-3. Ensure accuracy and consistency throughout documents
-4. Format content appropriately for the medium
-5. Edit and refine text for clarity and impact
-
-Writing principles:
-- Know your audience and write for them
-- Start with a clear structure and outline
-- Use appropriate tone and vocabulary
-- Include relevant examples and evidence
-- Ensure logical flow between sections
-- Proofread for grammar and clarity
-
-Available writing styles: {styles}
-Document types you can create: {doc_types}
-
-When writing:
-1. Understand the requirements and constraints
-2. Research the topic if needed
-3. Create an outline or structure
-4. Write clear, concise content
-5. Review and refine the output"""),
-            ("human", "{query}"),
-            ("system", "Create the requested written content following best practices.")
+        # The template is static, so build it once per agent
+        self._prompt_template = self._create_prompt()
+        
+        # Short-form documents can be routed to a smaller, cheaper model
+        short_form_llm = self.config.get("short_form_llm")
+        self._model_routes: Dict[DocumentType, Tuple[Any, ChatPromptTemplate]] = {}
+        if short_form_llm is not None:
+            route = (short_form_llm, self._create_prompt(short_form_llm))
+            self._model_routes = {doc_type: route for doc_type in _SHORT_FORM_TYPES}
+        
+        # Generated content keyed on the normalized task, kept locally and
+        # shared through Redis only when enabled
+        self.content_cache: Optional[TTLCache] = TTLCache(
+            maxsize=self.config.get("content_cache_size", 256),
+            ttl=self.config.get("content_cache_ttl", 3600)
+        ) if self.config.get("content_cache", False) else None
+        self.shared_content_cache = self.config.get("shared_content_cache", False)
+        self.cache_hits = 0
+        self.cache_misses = 0
+        
+        # Paraphrased topics match semantically when enabled and embeddings are configured
+        embeddings = self.config.get("embeddings")
+        self._content_semantic_cache = SemanticCache(
+            embeddings, self.config.get("semantic_cache_threshold", 0.95)
+        ) if embeddings and self.config.get("semantic_content_cache", False) else None
+        
+    def _create_prompt(self, llm: Optional[Any] = None) -> ChatPromptTemplate:
+        """
+        Create the writer's prompt template.
+        
+        The writing principles lead as the system message, marked cacheable
+        for Anthropic models; the task specification follows in the human turn.
+        
+        Args:
+            llm: Model the template is for, defaults to the agent's own
+        """
+        if self.supports_prompt_caching(llm):
+            system_message = SystemMessage(content=[cached_text_block(_WRITER_SYSTEM_PROMPT)])
+        else:
+            system_message = SystemMessage(content=_WRITER_SYSTEM_PROMPT)
+        
+        return ChatPromptTemplate(messages=[
+            system_message,
+            HumanMessagePromptTemplate.from_template(
+                "Create the requested written content following best practices.\n\n{query}"
+            )
         ])
     
     async def _execute_core(
@@ -144,6 +337,10 @@ When writing:
         try:
             # Update status
             self.status = AgentStatus.EXECUTING
+            
+            # One timestamp for everything this request records
+            now_iso = utc_now_iso()
+            
             yield self._create_event("writing_started", {
                 "query": request.query
             })
@@ -176,7 +373,15 @@ When writing:
                 "message": "Writing content..."
             })
             
-            content = await self._write_content(task, outline)
+            # Forward content tokens as they stream and keep the final content
+            content: Optional[WrittenContent] = None
+            async for item in self._write_content(
+                task, outline, stream=request.stream, created_at=now_iso
+            ):
+                if isinstance(item, AgentEvent):
+                    yield item
+                else:
+                    content = item
             
             # Phase 3: Editing
             yield self._create_event("phase", {
@@ -184,25 +389,28 @@ When writing:
                 "message": "Reviewing and refining..."
             })
             
-            final_content = await self._edit_content(content, task)
+            # Edited in place, so no second copy of the document is held
+            content = await self._edit_content(content, task)
             
-            # Calculate metrics
-            word_count = len(final_content.content.split())
+            # Calculate metrics; the word count was taken while writing, and
+            # editing only normalizes whitespace
+            word_count = content.word_count
             reading_time = max(1, word_count // 200)  # Average reading speed
+            content.reading_time = reading_time
             
-            final_content.word_count = word_count
-            final_content.reading_time = reading_time
+            # Dump once and share the payload between the event and the context
+            payload = content.model_dump()
             
             # Emit the final content
             yield self._create_event("writing_complete", {
-                "content": final_content.dict(),
+                "content": payload,
                 "word_count": word_count,
                 "reading_time": reading_time
             })
             
             # Store in context for other agents
             if request.context:
-                request.context.metadata["written_content"] = final_content.dict()
+                request.context.metadata["written_content"] = payload
             
         except Exception as e:
             logger.error(f"Writing failed: {e}", exc_info=True)
@@ -222,33 +430,17 @@ When writing:
             Structured writing task
         """
         # Simple parsing - in production, use NLP or LLM
-        task = WritingTask(
-            type=DocumentType.ARTICLE,  # Default
+        query_lower = query.lower()
+        
+        # One scan per table; ties resolve in table order
+        return WritingTask(
+            type=_first_keyword_match(_DOC_TYPE_RE, _DOC_TYPE_KEYWORDS, query_lower, DocumentType.ARTICLE),
             topic=query,
             audience="general",
-            style=WritingStyle.PROFESSIONAL
+            style=_first_keyword_match(_STYLE_RE, _STYLE_KEYWORDS, query_lower, WritingStyle.PROFESSIONAL)
         )
-        
-        # Check for document type keywords
-        query_lower = query.lower()
-        for doc_type in DocumentType:
-            if doc_type.value.replace("_", " ") in query_lower:
-                task.type = doc_type
-                break
-        
-        # Check for style indicators
-        if "technical" in query_lower:
-            task.style = WritingStyle.TECHNICAL
-        elif "creative" in query_lower:
-            task.style = WritingStyle.CREATIVE
-        elif "academic" in query_lower:
-            task.style = WritingStyle.ACADEMIC
-        elif "marketing" in query_lower or "sales" in query_lower:
-            task.style = WritingStyle.MARKETING
-        
-        return task
     
-    async def _create_outline(self, task: WritingTask) -> List[str]:
+    async def _create_outline(self, task: WritingTask) -> Sequence[str]:
         """
         Create a document outline.
         
@@ -261,143 +453,309 @@ When writing:
         if task.outline:
             return task.outline
         
-        # Generate outline based on document type
-        if task.type == DocumentType.REPORT:
-            outline = [
-                "Executive Summary",
-                "Introduction",
-                "Methodology",
-                "Findings",
-                "Analysis",
-                "Recommendations",
-                "Conclusion"
-            ]
-        elif task.type == DocumentType.ARTICLE:
-            outline = [
-                "Introduction",
-                "Main Points",
-                "Supporting Evidence",
-                "Conclusion"
-            ]
-        elif task.type == DocumentType.DOCUMENTATION:
-            outline = [
-                "Overview",
-                "Getting Started",
-                "Features",
-                "Usage",
-                "Examples",
-                "API Reference",
-                "Troubleshooting"
-            ]
-        elif task.type == DocumentType.PROPOSAL:
-            outline = [
-                "Executive Summary",
-                "Problem Statement",
-                "Proposed Solution",
-                "Implementation Plan",
-                "Timeline",
-                "Budget",
-                "Conclusion"
-            ]
-        else:
-            # Generic outline
-            outline = [
-                "Introduction",
-                "Main Content",
-                "Conclusion"
-            ]
-        
-        return outline
+        # Standard outline for the document type
+        return _OUTLINES.get(task.type, _DEFAULT_OUTLINE)
     
     async def _write_content(
         self,
         task: WritingTask,
-        outline: List[str]
-    ) -> WrittenContent:
+        outline: Sequence[str],
+        stream: bool = True,
+        created_at: Optional[str] = None
+    ) -> AsyncIterator[Union[AgentEvent, WrittenContent]]:
         """
         Write the actual content.
         
         Args:
             task: Writing task
             outline: Document outline
+            stream: Whether to stream the content as it is generated
+            created_at: Request timestamp to record, defaults to now
             
-        Returns:
-            Written content
+        Yields:
+            content_token events while streaming, then the written content
         """
         # Format the prompt
-        prompt = self._create_prompt()
+        llm, prompt = self._model_routes.get(task.type, (self.llm, self._prompt_template))
         
-        writing_prompt = f"""
-Create a {task.type.value} about: {task.topic}
-
-Target audience: {task.audience}
-Writing style: {task.style.value}
-Document outline:
-{chr(10).join(f'- {section}' for section in outline)}
-
-Requirements:
-{chr(10).join(f'- {req}' for req in task.requirements) if task.requirements else 'None specified'}
-
-Keywords to include: {', '.join(task.keywords) if task.keywords else 'None specified'}
-
-Please write comprehensive content following this structure.
-"""
+        lines = [
+            "",
+            f"Create a {task.type.value} about: {task.topic}",
+            "",
+            f"Target audience: {task.audience}",
+            f"Writing style: {task.style.value}",
+            "Document outline:"
+        ]
+        lines.extend(f"- {section}" for section in outline)
+        lines.append("")
+        lines.append("Requirements:")
+        if task.requirements:
+            lines.extend(f"- {req}" for req in task.requirements)
+        else:
+            lines.append("None specified")
+        lines.append("")
+        lines.append(f"Keywords to include: {', '.join(task.keywords) if task.keywords else 'None specified'}")
+        lines.append("")
+        lines.append("Please write comprehensive content following this structure.")
+        lines.append("")
+        writing_prompt = "\n".join(lines)
+        
+        scope, key = self._content_cache_keys(task, outline)
+        cached, vector = await self._lookup_content(task, scope, key, created_at)
+        if cached is not None:
+            self.cache_hits += 1
+            logger.info(f"Using cached content for: {task.topic}")
+            if stream:
+                yield self._create_event("content_token", {"delta": cached.content, "cached": True})
+            # Callers edit the content in place, so hand out a copy
+            yield cached.model_copy()
+            return
+        self.cache_misses += 1
         
         try:
-            # Generate content using LLM
-            response = await self.llm.ainvoke([HumanMessage(content=writing_prompt)])
+            # Generate content using LLM, within the process-wide concurrency cap
+            messages = prompt.format_messages(query=writing_prompt)
+            max_retries = settings.agent_max_retries
+            for attempt in range(max_retries + 1):
+                # Forward tokens as they arrive, keeping the full text for
+                # parsing and a running word count; a word split across two
+                # chunks is counted once
+                buffer = []
+                word_count = 0
+                in_word = False
+                try:
+                    if stream:
+                        # The provider stream is drained by its own task, so a
+                        # slow consumer never holds a concurrency permit
+                        deltas: asyncio.Queue = asyncio.Queue()
+                        producer = asyncio.create_task(self._pump_stream(llm, messages, deltas))
+                        try:
+                            while (delta := await deltas.get()) is not None:
+                                buffer.append(delta)
+                                word_count += len(delta.split())
+                                if in_word and not delta[0].isspace():
+                                    word_count -= 1
+                                in_word = not delta[-1].isspace()
+                                yield self._create_event("content_token", {"delta": delta})
+                        finally:
+                            producer.cancel()
+                        # Surfaces any error the stream raised
+                        await producer
+                        text = "".join(buffer)
+                    else:
+                        async with self._llm_semaphore():
+                            response = await llm.ainvoke(messages)
+                        text = response.content
+                        word_count = len(text.split())
+                        # Keep only the text alive, not the whole message
+                        del response
+                    break
+                except Exception as e:
+                    # Retry rate limits with backoff, unless tokens already went out;
+                    # the wait happens without holding a concurrency permit
+                    delay = _rate_limit_delay(e, attempt)
+                    if delay is None or buffer or attempt == max_retries:
+                        raise
+                    logger.warning(f"Writer LLM rate limited, retrying in {delay:.1f}s")
+                    await asyncio.sleep(delay)
+            # The joined text replaces the streamed pieces
+            del buffer
             
             # Parse response into structured content
             content = WrittenContent(
                 title=self._extract_title(task.topic),
-                content=response.content,
-                summary=self._generate_summary(response.content),
-                sections=self._parse_sections(response.content, outline),
-                metadata={
-                    "type": task.type.value,
-                    "style": task.style.value,
-                    "audience": task.audience,
-                    "created_at": datetime.utcnow().isoformat()
-                },
-                word_count=0,  # Will be calculated later
+                content=text,
+                summary=self._generate_summary(text),
+                sections=self._parse_sections(text, outline),
+                metadata=self._content_metadata(task, created_at),
+                word_count=word_count,
                 reading_time=0  # Will be calculated later
             )
             
-            return content
+            await self._store_content(scope, key, vector, content)
+            yield content.model_copy()
             
         except Exception as e:
             logger.error(f"Content generation failed: {e}")
             # Return basic content as fallback
-            return WrittenContent(
+            fallback = f"Content about {task.topic}"
+            yield WrittenContent(
                 title=task.topic,
-                content=f"Content about {task.topic}",
+                content=fallback,
                 summary="Summary pending",
                 sections=[],
                 metadata={},
-                word_count=0,
+                word_count=len(fallback.split()),
                 reading_time=0
             )
     
+    async def _pump_stream(
+        self,
+        llm: Any,
+        messages: List[BaseMessage],
+        deltas: asyncio.Queue
+    ) -> None:
+        """
+        Stream an LLM response into a queue within the concurrency cap.
+        
+        Args:
+            llm: Model to stream from
+            messages: Prompt messages
+            deltas: Queue receiving text deltas, then None once the stream ends
+        """
+        try:
+            async with self._llm_semaphore():
+                async for chunk in llm.astream(messages):
+                    delta = chunk.content if isinstance(chunk.content, str) else "".join(
+                        block.get("text", "") for block in chunk.content if isinstance(block, dict)
+                    )
+                    if delta:
+                        deltas.put_nowait(delta)
+        finally:
+            deltas.put_nowait(None)
+    
+    @staticmethod
+    def _content_cache_keys(task: WritingTask, outline: Sequence[str]) -> Tuple[str, str]:
+        """
+        Build cache keys for a writing task.
+        
+        Args:
+            task: Writing task
+            outline: Document outline
+            
+        Returns:
+            Tuple of (digest of everything but the topic, digest of the whole task)
+        """
+        scope = hashlib.blake2b("|".join([
+            task.type.value,
+            task.style.value,
+            task.audience.lower(),
+            "\x1f".join(outline),
+            "\x1f".join(task.requirements),
+            "\x1f".join(task.keywords)
+        ]).encode(), digest_size=16).hexdigest()
+        topic = _WS_RE.sub(" ", task.topic.strip().lower())
+        key = hashlib.blake2b(f"{scope}|{topic}".encode(), digest_size=16).hexdigest()
+        return scope, key
+    
+    @staticmethod
+    def _content_metadata(task: WritingTask, created_at: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Build the metadata attached to written content.
+        
+        Args:
+            task: Writing task
+            created_at: Creation timestamp, defaulting to now
+            
+        Returns:
+            Content metadata
+        """
+        return {
+            "type": task.type.value,
+            "style": task.style.value,
+            "audience": task.audience,
+            "created_at": created_at or utc_now_iso()
+        }
+    
+    async def _lookup_content(
+        self,
+        task: WritingTask,
+        scope: str,
+        key: str,
+        created_at: Optional[str] = None
+    ) -> Tuple[Optional[WrittenContent], Optional[np.ndarray]]:
+        """
+        Look up previously generated content for a task.
+        
+        Checks the local cache, then Redis, then topics similar to this one
+        written under the same scope.
+        
+        Args:
+            task: Writing task
+            scope: Task digest without the topic
+            key: Full task digest
+            created_at: Creation timestamp given to cached content
+            
+        Returns:
+            Tuple of (cached content or None, topic vector for a later store)
+        """
+        # Cached bodies are reused, but metadata always describes this request
+        if self.content_cache is not None:
+            cached = self.content_cache.get(key)
+            if cached is not None:
+                return cached.model_copy(update={"metadata": self._content_metadata(task, created_at)}), None
+        
+        if self.shared_content_cache:
+            data = await redis_manager.get_written_content(key)
+            if data:
+                cached = WrittenContent.model_validate(data)
+                if self.content_cache is not None:
+                    self.content_cache[key] = cached
+                return cached.model_copy(update={"metadata": self._content_metadata(task, created_at)}), None
+        
+        vector = None
+        if self._content_semantic_cache:
+            vector = await self._content_semantic_cache.embed(task.topic)
+            hit = self._content_semantic_cache.lookup_vector(vector)
+            if hit is not None and hit["scope"] == scope:
+                # A similar topic's body is reused under this task's title
+                cached = hit["content"].model_copy(update={
+                    "title": self._extract_title(task.topic),
+                    "metadata": self._content_metadata(task, created_at)
+                })
+                if self.content_cache is not None:
+                    self.content_cache[key] = cached
+                return cached, vector
+        
+        return None, vector
+    
+    async def _store_content(
+        self,
+        scope: str,
+        key: str,
+        vector: Optional[np.ndarray],
+        content: WrittenContent
+    ) -> None:
+        """
+        Cache generated content for later identical or similar tasks.
+        
+        Args:
+            scope: Task digest without the topic
+            key: Full task digest
+            vector: Topic vector from ``_lookup_content``
+            content: Generated content
+        """
+        if self.content_cache is not None:
+            self.content_cache[key] = content
+        if self.shared_content_cache:
+            await redis_manager.save_written_content(
+                key, content.model_dump(), ttl=self.config.get("content_cache_ttl", 3600)
+            )
+        if self._content_semantic_cache:
+            self._content_semantic_cache.add(vector, {"scope": scope, "content": content})
+    
     async def _edit_content(
         self,
         content: WrittenContent,
         task: WritingTask
     ) -> WrittenContent:
         """
-        Edit and refine content.
+        Edit and refine content in place.
         
         Args:
             content: Initial content
             task: Writing task
             
         Returns:
-            Edited content
+            The same content instance, edited
         """
         # In production, this would use LLM for editing
         # For now, just return the content with minor processing
         
-        # Clean up whitespace
-        content.content = " ".join(content.content.split())
+        # Collapse whitespace, rewriting the text only when it needs it
+        text = content.content
+        if _UNNORMALIZED_WS_RE.search(text) or text != text.strip():
+            content.content = _WS_RE.sub(" ", text).strip()
         
         # Ensure summary exists
         if not content.summary:
@@ -433,18 +791,17 @@ Please write comprehensive content following this structure.
         Returns:
             Summary
         """
-        # Simple summary - take first 200 characters
-        if len(content) > 200:
-            summary = content[:200].rsplit(" ", 1)[0] + "..."
-        else:
-            summary = content
+        # Simple summary - take first 200 characters, cut at the last space
+        if len(content) <= 200:
+            return content
         
-        return summary
+        cut = content.rfind(" ", 0, 200)
+        return content[:cut if cut != -1 else 200] + "..."
     
     def _parse_sections(
         self,
         content: str,
-        outline: List[str]
+        outline: Sequence[str]
     ) -> List[Dict[str, str]]:
         """
         Parse content into sections.
@@ -456,15 +813,38 @@ Please write comprehensive content following this structure.
         Returns:
             List of sections
         """
-        sections = []
+        if not outline:
+            return []
         
-        # Try to find section headers in content
-        for section_name in outline:
-            # Look for section header
-            if section_name.lower() in content.lower():
-                sections.append({
-                    "name": section_name,
-                    "content": f"Content for {section_name}"  # Placeholder
-                })
+        # One pass over the content finds every header line naming a section.
+        # Markdown and bold headings may carry extra words ("## Introduction
+        # to X"); plain or numbered lines must be just the section name
+        names = {section_name.lower(): section_name for section_name in outline}
+        alternation = "|".join(map(re.escape, sorted(names, key=len, reverse=True)))
+        header_re = re.compile(
+            rf"^[ \t]*#+[^\n]*?\b({alternation})\b[^\n]*$"
+            rf"|^[ \t]*(?:\d+[.)][ \t]*)?\*\*[^\n*]*?\b({alternation})\b[^\n*]*\*\*[ \t]*:?[ \t]*$"
+            rf"|^[ \t]*(?:\d+[.)][ \t]*)?({alternation})[ \t]*:?[ \t]*$",
+            re.IGNORECASE | re.MULTILINE
+        )
+        headers = list(header_re.finditer(content))
         
-        return sections
\ No newline at end of file
+        # Each section's body runs up to the next header
+        sections = []
+        seen = set()
+        for i, match in enumerate(headers):
+            name = names[next(group for group in match.groups() if group).lower()]
+            if name in seen:
+                continue
+            seen.add(name)
+            end = headers[i + 1].start() if i + 1 < len(headers) else len(content)
+            sections.append({
+                "name": name,
+                "content": content[match.end():end].strip()
+            })
+        
+        return sections
+
+
+# Agent class picked up by AgentRegistry.auto_discover
+AGENT_CLASS = WriterAgent
@@ -5,17 +5,32 @@ Supports both self-hosted and managed instance deployments with
 ability to create, share, and customize agents dynamically.
 """
 
-from typing import List, Dict, Any, Optional, Union
+from typing import List, Dict, Any, Optional, Set, Union
+from collections import defaultdict
 from enum import Enum
 from datetime import datetime
+import asyncio
 import json
 import yaml
 import hashlib
+import os
+import re
+import tempfile
+import time
 from pathlib import Path
-from pydantic import BaseModel, Field, HttpUrl
+import httpx
+from cachetools import TTLCache
+from langchain_core.embeddings import Embeddings
+from pydantic import BaseModel, Field, HttpUrl, TypeAdapter
+
+try:
+    from yaml import CSafeLoader as YamlLoader, CSafeDumper as YamlDumper
+except ImportError:
+    from yaml import SafeLoader as YamlLoader, SafeDumper as YamlDumper
 
 from app.agents.engine.base import BaseAgent, AgentCapability
 from app.agents.engine.registry import get_registry
+from app.core.semantic_cache import SemanticCache
 
 import logging
 logger = logging.getLogger(__name__)
@@ -132,6 +147,19 @@ class AgentTemplate(BaseModel):
     use_cases: List[str] = Field(default_factory=list, description="Common use cases")
 
 
+# Built once so marketplace responses are parsed and validated straight from
+# raw JSON bytes in pydantic-core, without an intermediate dict.
+_PACKAGE_ADAPTER = TypeAdapter(AgentPackage)
+_PACKAGE_LIST_ADAPTER = TypeAdapter(List[AgentPackage])
+
+_PLACEHOLDER_RE = re.compile(r"\{([^{}]+)\}")
+
+
+def _relevance(package: AgentPackage) -> float:
+    """Sort key for search results, weighting downloads and rating."""
+    return package.downloads * 0.3 + package.rating * 100
+
+
 class AgentBuilder:
     """
     Builder for creating agents dynamically from templates or specifications.
@@ -165,14 +193,14 @@ class AgentBuilder:
         
         # Generate agent ID if not provided
         if not agent_id:
-            agent_id = f"{template_id}_{datetime.utcnow().timestamp()}"
+            agent_id = f"{template_id}_{time.time_ns()}"
         
         # Build configuration
         config = {
             "id": agent_id,
             "name": customizations.get("name", template.name),
             "description": customizations.get("description", template.description),
-            "category": template.category,
+            "category": template.category.value,
             "capabilities": template.capabilities,
             "tools": customizations.get("tools", template.default_tools),
             "prompt": self._render_prompt(template.base_prompt, customizations),
@@ -196,7 +224,7 @@ class AgentBuilder:
             Agent configuration dictionary
         """
         try:
-            config = yaml.safe_load(yaml_content)
+            config = yaml.load(yaml_content, Loader=YamlLoader)
             
             # Validate required fields
             required = ["id", "name", "description"]
@@ -225,12 +253,13 @@ class AgentBuilder:
         Returns:
             Rendered prompt
         """
-        prompt = template
-        for key, value in variables.items():
-            placeholder = f"{{{key}}}"
-            if placeholder in prompt:
-                prompt = prompt.replace(placeholder, str(value))
-        return prompt
+        # Single pass over the template; unknown placeholders and literal
+        # braces are left untouched, which str.format_map would not allow
+        def substitute(match: re.Match) -> str:
+            key = match.group(1)
+            return str(variables[key]) if key in variables else match.group(0)
+        
+        return _PLACEHOLDER_RE.sub(substitute, template)
     
     def export_agent(self, agent_id: str, include_code: bool = False) -> Dict[str, Any]:
         """
@@ -314,8 +343,18 @@ class AgentBuilder:
         
         config_file = config_dir / f"{agent_id}.yaml"
         
-        with open(config_file, 'w') as f:
-            yaml.dump(config, f, default_flow_style=False)
+        # Write to a uniquely named sibling temp file and rename so the registry
+        # never reads a half-written definition and concurrent saves don't collide
+        tmp_file = tempfile.NamedTemporaryFile(
+            'w', dir=config_dir, prefix=f".{agent_id}.", suffix=".tmp", delete=False
+        )
+        try:
+            with tmp_file as f:
+                yaml.dump(config, f, Dumper=YamlDumper, default_flow_style=False)
+            os.replace(tmp_file.name, config_file)
+        except BaseException:
+            Path(tmp_file.name).unlink(missing_ok=True)
+            raise
         
         logger.info(f"Stored agent config: {config_file}")
 
@@ -326,17 +365,73 @@ class MarketplaceService:
     Handles discovery, installation, and management of agents.
     """
     
-    def __init__(self, marketplace_url: Optional[str] = None):
+    def __init__(
+        self,
+        marketplace_url: Optional[str] = None,
+        embeddings: Optional[Embeddings] = None
+    ):
         """
         Initialize marketplace service.
         
         Args:
             marketplace_url: URL of the marketplace API (for managed instances)
+            embeddings: Optional embedding model for matching paraphrased queries
         """
         self.marketplace_url = marketplace_url
         self.builder = AgentBuilder()
         self.local_packages: Dict[str, AgentPackage] = {}
         self.installed_agents: Dict[str, str] = {}  # agent_id -> version
+        
+        # Inverted indexes over local_packages, maintained by _index_package
+        self._by_category: Dict[AgentCategory, Set[str]] = defaultdict(set)
+        self._by_tag: Dict[str, Set[str]] = defaultdict(set)
+        self._relevance_by_id: Dict[str, float] = {}
+        self._search_text: Dict[str, str] = {}
+        self._ranked_ids: Optional[List[str]] = None
+        
+        # Exact-match result cache, cleared whenever the local catalog changes;
+        # the TTL bounds staleness of merged remote results
+        self._query_cache: TTLCache = TTLCache(maxsize=256, ttl=300)
+        
+        # Maps paraphrased queries onto a previously seen normalized query
+        self._query_semantic_cache = SemanticCache(embeddings, threshold=0.92) if embeddings else None
+    
+    def _index_package(self, package: AgentPackage) -> None:
+        """
+        Add a package to local_packages and the search indexes.
+        
+        Args:
+            package: Package to index, replacing any package with the same ID
+        """
+        previous = self.local_packages.get(package.id)
+        if previous is not None:
+            self._by_category[previous.category].discard(previous.id)
+            for tag in previous.tags:
+                self._by_tag[tag].discard(previous.id)
+        
+        self.local_packages[package.id] = package
+        self._by_category[package.category].add(package.id)
+        for tag in package.tags:
+            self._by_tag[tag].add(package.id)
+        self._relevance_by_id[package.id] = _relevance(package)
+        self._search_text[package.id] = " ".join(
+            f"{package.name} {package.description} {' '.join(package.tags)}".lower().split()
+        )
+        self._ranked_ids = None
+        self._query_cache.clear()
+    
+    def _ranking(self) -> List[str]:
+        """
+        Get all local package IDs ordered by relevance, rebuilt after changes.
+        
+        Returns:
+            Package IDs, most relevant first
+        """
+        if self._ranked_ids is None:
+            self._ranked_ids = sorted(
+                self._relevance_by_id, key=self._relevance_by_id.__getitem__, reverse=True
+            )
+        return self._ranked_ids
     
     async def search(
         self,
@@ -357,34 +452,110 @@ class MarketplaceService:
         Returns:
             List of matching agent packages
         """
+        normalized = " ".join(query.lower().split()) if query else None
+        filters = (category, tuple(sorted(set(tags))) if tags else (), verified_only)
+        
+        cached = self._query_cache.get((normalized, *filters))
+        if cached is not None:
+            return list(cached)
+        
+        # A paraphrase of an earlier query reuses that query's results
+        vector = None
+        if normalized and self._query_semantic_cache:
+            similar, vector = await self._query_semantic_cache.lookup(normalized)
+            if similar is not None:
+                cached = self._query_cache.get((similar, *filters))
+                if cached is not None:
+                    self._query_cache[(normalized, *filters)] = cached
+                    return list(cached)
+        
+        # Searching by the normalized query keeps results consistent with the
+        # cache key, so every spelling that shares a key shares the same results
+        results = await self._search_uncached(normalized, category, tags, verified_only)
+        
+        self._query_cache[(normalized, *filters)] = tuple(results)
+        if vector is not None:
+            self._query_semantic_cache.add(vector, normalized)
+        
+        return results
+    
+    async def _search_uncached(
+        self,
+        query: Optional[str],
+        category: Optional[AgentCategory],
+        tags: Optional[List[str]],
+        verified_only: bool
+    ) -> List[AgentPackage]:
+        """
+        Run a search against the local indexes and the remote marketplace.
+        
+        Args:
+            query: Normalized search query (lowercase, single-spaced)
+            category: Filter by category
+            tags: Filter by tags
+            verified_only: Only return verified agents
+            
+        Returns:
+            List of matching agent packages, most relevant first
+        """
+        # Narrow local candidates through the indexes before any per-package work
+        unfiltered = not category and not tags
+        if category:
+            candidate_ids = self._by_category.get(category, set())
+        else:
+            candidate_ids = self.local_packages.keys()
+        if tags:
+            tagged = set().union(*(self._by_tag.get(tag, ()) for tag in tags))
+            candidate_ids = tagged.intersection(candidate_ids)
+        
+        # Large candidate sets are read off the catalog-wide ranking in order,
+        # so only small filtered sets pay for a sort
+        if unfiltered:
+            ordered_ids = self._ranking()
+        elif len(candidate_ids) * 4 > len(self.local_packages):
+            ordered_ids = [pid for pid in self._ranking() if pid in candidate_ids]
+        else:
+            ordered_ids = sorted(candidate_ids, key=self._relevance_by_id.__getitem__, reverse=True)
+        
         results = []
         
         # Search local packages first
-        for package in self.local_packages.values():
+        for package_id in ordered_ids:
+            package = self.local_packages[package_id]
             if verified_only and not package.verified:
                 continue
             
-            if category and package.category != category:
-                continue
-            
-            if tags and not any(tag in package.tags for tag in tags):
+            # Simple text search over the precomputed normalized text
+            if query and query not in self._search_text[package_id]:
                 continue
             
-            if query:
-                # Simple text search
-                search_text = f"{package.name} {package.description} {' '.join(package.tags)}".lower()
-                if query.lower() not in search_text:
-                    continue
-            
             results.append(package)
         
         # If connected to marketplace, search remote
         if self.marketplace_url:
-            # TODO: Implement remote marketplace search
-            pass
-        
-        # Sort by relevance (downloads + rating)
-        results.sort(key=lambda p: (p.downloads * 0.3 + p.rating * 100), reverse=True)
+            params = {"verified_only": verified_only}
+            if query:
+                params["query"] = query
+            if category:
+                params["category"] = category.value
+            if tags:
+                params["tags"] = tags
+            try:
+                async with httpx.AsyncClient(base_url=self.marketplace_url) as client:
+                    response = await client.get("/packages", params=params)
+                    response.raise_for_status()
+                seen = {package.id for package in results}
+                remote = [
+                    package
+                    for package in _PACKAGE_LIST_ADAPTER.validate_json(response.content)
+                    if package.id not in seen
+                ]
+                if remote:
+                    # Local results are already ordered; re-sort only the merged list
+                    results.extend(remote)
+                    results.sort(key=_relevance, reverse=True)
+            except Exception as e:
+                logger.warning(f"Remote marketplace search failed: {e}")
         
         return results
     
@@ -440,13 +611,13 @@ class MarketplaceService:
                 "config": package.default_config,
                 "metadata": {
                     "installed_at": datetime.utcnow().isoformat(),
-                    "source": package.source,
+                    "source": package.source.value,
                     "package_id": package.id
                 }
             }
             
-            # Store configuration
-            self.builder._store_agent_config(package_id, config)
+            # Store configuration off the event loop
+            await asyncio.to_thread(self.builder._store_agent_config, package_id, config)
             
             # Register with the system
             registry = get_registry()
@@ -512,8 +683,15 @@ class MarketplaceService:
         
         # If connected to marketplace, fetch from remote
         if self.marketplace_url:
-            # TODO: Implement remote fetch
-            pass
+            try:
+                async with httpx.AsyncClient(base_url=self.marketplace_url) as client:
+                    response = await client.get(f"/packages/{package_id}")
+                if response.status_code == 404:
+                    return None
+                response.raise_for_status()
+                return _PACKAGE_ADAPTER.validate_json(response.content)
+            except Exception as e:
+                logger.warning(f"Failed to fetch package {package_id}: {e}")
         
         return None
     
@@ -538,27 +716,29 @@ class MarketplaceService:
         if not agent_info:
             raise ValueError(f"Agent {agent_id} not found")
         
-        package = AgentPackage(
-            id=agent_id,
-            name=metadata.get("name", agent_info["name"]),
-            description=metadata.get("description", agent_info["description"]),
-            author=metadata.get("author", "Unknown"),
-            category=metadata.get("category", AgentCategory.CUSTOM),
-            latest_version=metadata.get("version", "0.1.0"),
-            capabilities=agent_info["capabilities"],
-            source=AgentSource.LOCAL,
-            license=metadata.get("license", AgentLicense.MIT),
-            config_schema=metadata.get("config_schema", {}),
-            default_config=agent_info["config"]
-        )
-        
-        # Add initial version
-        package.versions.append(AgentVersion(
+        # Caller metadata is validated; registry info is produced by our own
+        # code, so it is attached afterwards without re-validation
+        package = AgentPackage.model_validate({
+            "id": agent_id,
+            "name": metadata.get("name", agent_info["name"]),
+            "description": metadata.get("description", agent_info["description"]),
+            "author": metadata.get("author", "Unknown"),
+            "category": metadata.get("category", AgentCategory.CUSTOM),
+            "latest_version": metadata.get("version", "0.1.0"),
+            "source": AgentSource.LOCAL,
+            "license": metadata.get("license", AgentLicense.MIT),
+            "config_schema": metadata.get("config_schema", {}),
+        })
+        package.capabilities = list(agent_info["capabilities"])
+        package.default_config = agent_info["config"]
+        
+        # Add initial version; the version string was validated above
+        package.versions.append(AgentVersion.model_construct(
             version=package.latest_version,
             changelog="Initial release"
         ))
         
         # Store locally
-        self.local_packages[package.id] = package
+        self._index_package(package)
         
         return package
\ No newline at end of file
@@ -5,18 +5,32 @@ Provides common functionality like search, data manipulation,
 and integration with external services.
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, FrozenSet, Optional, Set, Tuple
 from datetime import datetime
+from functools import lru_cache
+import ast
 import json
 import logging
+import operator
+
+import orjson
+from cachetools import TTLCache
 
 from langchain_core.tools import BaseTool, StructuredTool
 from langchain_core.pydantic_v1 import BaseModel, Field
-from langchain_community.tools import DuckDuckGoSearchRun
-from langchain_community.utilities import WikipediaAPIWrapper
 
 logger = logging.getLogger(__name__)
 
+# Memory stores keyed by session, so memory persists across tool lookups;
+# bounded, and a store expires an hour after its session last used it
+_session_memory: TTLCache = TTLCache(maxsize=1024, ttl=3600)
+
+# Stateless tools, built once every tool could be created or its package
+# is known to be missing, and the per-capability selections made from them
+_unavailable_tools: Set[str] = set()
+_stateless_tool_cache: Optional[Tuple[BaseTool, ...]] = None
+_capability_tool_cache: Dict[Optional[str], Tuple[BaseTool, ...]] = {}
+
 
 class SearchInput(BaseModel):
     """Input for search tool."""
@@ -42,6 +56,110 @@ class JSONInput(BaseModel):
     data: str = Field(..., description="JSON data or Python object string")
 
 
+_CALC_FUNCTIONS = {
+    "abs": abs,
+    "round": round,
+    "min": min,
+    "max": max,
+}
+
+# Upper bounds that keep a single expression from exhausting CPU or memory
+_CALC_MAX_EXPONENT = 10_000
+_CALC_MAX_INT_BITS = 16_384
+
+
+def _safe_pow(base: Any, exponent: Any) -> Any:
+    """Raise to a power, rejecting exponents or results that are too large."""
+    if isinstance(exponent, (int, float)) and abs(exponent) > _CALC_MAX_EXPONENT:
+        raise ValueError(f"Exponent too large (limit {_CALC_MAX_EXPONENT})")
+    if (
+        isinstance(base, int) and isinstance(exponent, int) and exponent > 0
+        and base.bit_length() * exponent > _CALC_MAX_INT_BITS
+    ):
+        raise ValueError("Result too large")
+    return operator.pow(base, exponent)
+
+
+_CALC_BINOPS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: _safe_pow,
+}
+
+_CALC_UNARYOPS = {
+    ast.UAdd: operator.pos,
+    ast.USub: operator.neg,
+}
+
+
+def _eval_constant(node: ast.Constant) -> Any:
+    """Accept int and float literals only."""
+    if type(node.value) not in (int, float):
+        raise ValueError(f"Unsupported constant: {node.value!r}")
+    return node.value
+
+
+def _eval_binop(node: ast.BinOp) -> Any:
+    """Apply a whitelisted binary operator."""
+    op = _CALC_BINOPS.get(type(node.op))
+    if op is None:
+        raise ValueError(f"Unsupported operator: {type(node.op).__name__}")
+    return op(_eval_node(node.left), _eval_node(node.right))
+
+
+def _eval_unaryop(node: ast.UnaryOp) -> Any:
+    """Apply unary plus or minus."""
+    op = _CALC_UNARYOPS.get(type(node.op))
+    if op is None:
+        raise ValueError(f"Unsupported operator: {type(node.op).__name__}")
+    return op(_eval_node(node.operand))
+
+
+def _eval_call(node: ast.Call) -> Any:
+    """Call a whitelisted builtin with positional arguments."""
+    func = node.func
+    if not isinstance(func, ast.Name) or func.id not in _CALC_FUNCTIONS or node.keywords:
+        raise ValueError("Only abs, round, min and max can be called")
+    return _CALC_FUNCTIONS[func.id](*(_eval_node(arg) for arg in node.args))
+
+
+_CALC_NODES = {
+    ast.Constant: _eval_constant,
+    ast.BinOp: _eval_binop,
+    ast.UnaryOp: _eval_unaryop,
+    ast.Call: _eval_call,
+}
+
+
+def _eval_node(node: ast.AST) -> Any:
+    """Evaluate a whitelisted arithmetic AST node."""
+    handler = _CALC_NODES.get(type(node))
+    if handler is None:
+        raise ValueError(f"Unsupported expression: {type(node).__name__}")
+    return handler(node)
+
+
+@lru_cache(maxsize=256)
+def _evaluate_expression(expression: str) -> Any:
+    """
+    Evaluate an arithmetic expression without eval.
+    
+    Only numeric literals, arithmetic operators and a few numeric builtins
+    are accepted. Results are cached per expression.
+    
+    Args:
+        expression: Expression such as "round(2 ** 0.5, 3) + max(1, 2)"
+        
+    Returns:
+        The computed value
+    """
+    return _eval_node(ast.parse(expression.strip(), mode="eval").body)
+
+
 def create_search_tool() -> BaseTool:
     """
     Create a web search tool.
@@ -50,6 +168,9 @@ def create_search_tool() -> BaseTool:
         Search tool
     """
     try:
+        # Imported on first use; _stateless_tools keeps this to once per process
+        from langchain_community.tools import DuckDuckGoSearchRun
+        
         search = DuckDuckGoSearchRun()
         
         def search_wrapper(query: str, max_results: int = 5) -> str:
@@ -69,6 +190,11 @@ def create_search_tool() -> BaseTool:
             description="Search the web for current information",
             args_schema=SearchInput
         )
+    except ImportError as e:
+        # A missing package will not appear later, so stop retrying
+        logger.warning(f"Could not create search tool: {e}")
+        _unavailable_tools.add("web_search")
+        return None
     except Exception as e:
         logger.warning(f"Could not create search tool: {e}")
         return None
@@ -82,6 +208,8 @@ def create_wikipedia_tool() -> BaseTool:
         Wikipedia tool
     """
     try:
+        from langchain_community.utilities import WikipediaAPIWrapper
+        
         wikipedia = WikipediaAPIWrapper(
             top_k_results=3,
             doc_content_chars_max=4000
@@ -101,11 +229,16 @@ def create_wikipedia_tool() -> BaseTool:
             description="Search Wikipedia for detailed information",
             args_schema=SearchInput
         )
+    except ImportError as e:
+        logger.warning(f"Could not create Wikipedia tool: {e}")
+        _unavailable_tools.add("wikipedia_search")
+        return None
     except Exception as e:
         logger.warning(f"Could not create Wikipedia tool: {e}")
         return None
 
 
+@lru_cache(maxsize=1)
 def create_calculation_tool() -> BaseTool:
     """
     Create a calculation tool for basic math.
@@ -116,23 +249,7 @@ def create_calculation_tool() -> BaseTool:
     def calculate(expression: str) -> str:
         """Perform mathematical calculations."""
         try:
-            # Safe evaluation of mathematical expressions
-            # In production, use a proper math parser
-            allowed_names = {
-                "abs": abs,
-                "round": round,
-                "min": min,
-                "max": max,
-                "sum": sum,
-                "len": len,
-            }
-            
-            # Remove potentially dangerous operations
-            if any(op in expression for op in ["import", "exec", "eval", "__"]):
-                return "Error: Invalid expression"
-            
-            result = eval(expression, {"__builtins__": {}}, allowed_names)
-            return str(result)
+            return str(_evaluate_expression(expression))
         except Exception as e:
             return f"Calculation error: {str(e)}"
     
@@ -144,6 +261,27 @@ def create_calculation_tool() -> BaseTool:
     )
 
 
+@lru_cache(maxsize=256)
+def _parse_datetime(date_string: str, fmt: Optional[str]) -> str:
+    """
+    Parse a date string to ISO format, cached per input.
+    
+    Without an explicit format the C-level ISO parser is used, which also
+    covers the previous "%Y-%m-%d" default.
+    
+    Args:
+        date_string: Date to parse
+        fmt: Optional strptime format
+        
+    Returns:
+        ISO-8601 datetime string
+    """
+    if fmt is None:
+        return datetime.fromisoformat(date_string).isoformat()
+    return datetime.strptime(date_string, fmt).isoformat()
+
+
+@lru_cache(maxsize=1)
 def create_datetime_tool() -> BaseTool:
     """
     Create a datetime manipulation tool.
@@ -167,9 +305,7 @@ def create_datetime_tool() -> BaseTool:
                 return dt.strftime(fmt)
             
             elif operation == "parse" and date_string:
-                fmt = format or "%Y-%m-%d"
-                dt = datetime.strptime(date_string, fmt)
-                return dt.isoformat()
+                return _parse_datetime(date_string, format)
             
             else:
                 return f"Unknown operation: {operation}"
@@ -185,6 +321,7 @@ def create_datetime_tool() -> BaseTool:
     )
 
 
+@lru_cache(maxsize=1)
 def create_json_tool() -> BaseTool:
     """
     Create a JSON manipulation tool.
@@ -196,17 +333,17 @@ def create_json_tool() -> BaseTool:
         """Perform JSON operations."""
         try:
             if operation == "parse":
-                obj = json.loads(data)
-                return json.dumps(obj, indent=2)
+                obj = orjson.loads(data)
+                return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
             
             elif operation == "stringify":
-                # Assume data is a Python dict string
-                obj = eval(data, {"__builtins__": {}}, {})
-                return json.dumps(obj)
+                # Assume data is a Python literal such as a dict string
+                obj = ast.literal_eval(data)
+                return orjson.dumps(obj).decode()
             
             elif operation == "validate":
                 try:
-                    json.loads(data)
+                    orjson.loads(data)
                     return "Valid JSON"
                 except:
                     return "Invalid JSON"
@@ -275,16 +412,21 @@ def create_memory_tool(memory_store: Dict[str, Any]) -> BaseTool:
     )
 
 
-def get_base_tools(include_memory: bool = True) -> List[BaseTool]:
+def _stateless_tools() -> Tuple[BaseTool, ...]:
     """
-    Get all base tools.
+    Build the tools that hold no per-caller state, once per process.
+    
+    A set missing a search tool for any reason other than an uninstalled
+    package is not cached, so a transient failure is retried on the next
+    call instead of dropping the tool for good.
     
-    Args:
-        include_memory: Whether to include memory tool
-        
     Returns:
-        List of base tools
+        Search and utility tools, skipping any that could not be created
     """
+    global _stateless_tool_cache
+    if _stateless_tool_cache is not None:
+        return _stateless_tool_cache
+    
     tools = []
     
     # Add search tools
@@ -301,38 +443,117 @@ def get_base_tools(include_memory: bool = True) -> List[BaseTool]:
     tools.append(create_datetime_tool())
     tools.append(create_json_tool())
     
+    tools = tuple(tools)
+    if (search_tool or "web_search" in _unavailable_tools) and (
+        wikipedia_tool or "wikipedia_search" in _unavailable_tools
+    ):
+        _stateless_tool_cache = tools
+    return tools
+
+
+def create_session_memory_tool(session_id: Optional[str]) -> BaseTool:
+    """
+    Create a memory tool over a session's store, or a private one.
+    
+    Args:
+        session_id: Session to share memory with, if any
+        
+    Returns:
+        Memory tool
+    """
+    if session_id is None:
+        return create_memory_tool({})
+    
+    memory_store = _session_memory.get(session_id)
+    if memory_store is None:
+        memory_store = {}
+    # Re-inserting restarts the TTL, so active sessions keep their memory
+    _session_memory[session_id] = memory_store
+    return create_memory_tool(memory_store)
+
+
+def get_base_tools(
+    include_memory: bool = True,
+    session_id: Optional[str] = None
+) -> List[BaseTool]:
+    """
+    Get all base tools.
+    
+    Args:
+        include_memory: Whether to include memory tool
+        session_id: Session whose memory store the memory tool should share;
+            without one the tool gets a private, empty store
+        
+    Returns:
+        List of base tools
+    """
+    tools = list(_stateless_tools())
+    
     # Add memory tool
     if include_memory:
-        memory_store = {}
-        tools.append(create_memory_tool(memory_store))
+        tools.append(create_session_memory_tool(session_id))
     
     return tools
 
 
-def get_tools_for_capability(capability: str) -> List[BaseTool]:
+# Tool names per capability; None means every base tool
+_CAPABILITY_TOOL_NAMES: Dict[str, Optional[FrozenSet[str]]] = {
+    # Research agents get all search tools
+    "research": None,
+    # Analysts get calculation and data tools
+    "analysis": frozenset({"calculator", "json_tool", "datetime_tool"}),
+    # Planners get datetime and memory tools
+    "planning": frozenset({"datetime_tool", "memory_tool"}),
+}
+
+# Default: basic tools
+_DEFAULT_TOOL_NAMES = frozenset({"calculator", "datetime_tool"})
+
+
+def _capability_tools(capability: Optional[str]) -> Tuple[BaseTool, ...]:
+    """
+    Select the stateless tools for a capability, once per capability.
+    
+    Args:
+        capability: Known capability, or None for the default set
+        
+    Returns:
+        Matching tools in base tool order
+    """
+    selected = _capability_tool_cache.get(capability)
+    if selected is not None:
+        return selected
+    
+    names = _CAPABILITY_TOOL_NAMES.get(capability, _DEFAULT_TOOL_NAMES)
+    tools = _stateless_tools()
+    selected = tools if names is None else tuple(t for t in tools if t.name in names)
+    # Only selections from a complete base set are kept
+    if tools is _stateless_tool_cache:
+        _capability_tool_cache[capability] = selected
+    return selected
+
+
+def get_tools_for_capability(
+    capability: str,
+    session_id: Optional[str] = None
+) -> List[BaseTool]:
     """
     Get tools appropriate for a specific capability.
     
     Args:
         capability: Agent capability
+        session_id: Optional session for a persistent memory tool
         
     Returns:
         List of relevant tools
     """
-    base_tools = get_base_tools()
+    if capability not in _CAPABILITY_TOOL_NAMES:
+        capability = None
+    tools = list(_capability_tools(capability))
     
-    if capability == "research":
-        # Research agents get all search tools
-        return base_tools
+    # The memory tool is stateful, so it is never part of the cached selection
+    names = _CAPABILITY_TOOL_NAMES.get(capability, _DEFAULT_TOOL_NAMES)
+    if names is None or "memory_tool" in names:
+        tools.append(create_session_memory_tool(session_id))
     
-    elif capability == "analysis":
-        # Analysts get calculation and data tools
-        return [t for t in base_tools if t.name in ["calculator", "json_tool", "datetime_tool"]]
-    
-    elif capability == "planning":
-        # Planners get datetime and memory tools
-        return [t for t in base_tools if t.name in ["datetime_tool", "memory_tool"]]
-    
-    else:
-        # Default: basic tools
-        return [t for t in base_tools if t.name in ["calculator", "datetime_tool"]]
\ No newline at end of file
+    return tools
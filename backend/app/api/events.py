@@ -5,29 +5,35 @@ from fastapi import APIRouter, Request, Query
 from fastapi.responses import StreamingResponse
 from typing import Optional, AsyncGenerator
 import asyncio
-import json
 from datetime import datetime
 
+import orjson
+
 router = APIRouter()
 
 
+def _sse(payload: dict) -> bytes:
+    """Frame a payload as an SSE data event; orjson serializes datetimes natively."""
+    return b"data: " + orjson.dumps(payload) + b"\n\n"
+
+
 async def event_generator(user_id: Optional[str] = None) -> AsyncGenerator:
     """
     Generate SSE events for the client
     """
     # Send initial connection event
-    yield f"data: {json.dumps({'type': 'connection', 'message': 'Connected to SSE', 'timestamp': datetime.utcnow().isoformat()})}\n\n"
+    yield _sse({'type': 'connection', 'message': 'Connected to SSE', 'timestamp': datetime.utcnow()})
     
     # Keep connection alive with heartbeat
     while True:
         try:
             # Send heartbeat every 30 seconds
             await asyncio.sleep(30)
-            yield f"data: {json.dumps({'type': 'heartbeat', 'timestamp': datetime.utcnow().isoformat()})}\n\n"
+            yield _sse({'type': 'heartbeat', 'timestamp': datetime.utcnow()})
         except asyncio.CancelledError:
             break
         except Exception as e:
-            yield f"data: {json.dumps({'type': 'error', 'message': str(e)})}\n\n"
+            yield _sse({'type': 'error', 'message': str(e)})
             break
 
 
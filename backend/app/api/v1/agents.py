@@ -8,7 +8,6 @@ from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from enum import Enum
 from datetime import datetime
-import json
 import logging
 
 from app.services.gemini_service import (
@@ -18,11 +17,17 @@ from app.services.gemini_service import (
     StreamingEvent
 )
 from app.core.auth import get_current_active_user, get_optional_user, User
+from app.agents.engine.base import dumps_json
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
+def _sse(payload: Dict[str, Any]) -> bytes:
+    """Frame a payload as an SSE data event; datetimes are serialized by orjson."""
+    return b"data: " + dumps_json(payload) + b"\n\n"
+
+
 class AgentType(str, Enum):
     PLANNER = "planner"
     RESEARCHER = "researcher"
@@ -202,7 +207,7 @@ async def generate_content_stream(
     - Progressive content generation
     - Final results
     """
-    async def event_generator() -> AsyncIterator[str]:
+    async def event_generator() -> AsyncIterator[bytes]:
         try:
             # Set user context
             if current_user:
@@ -211,34 +216,33 @@ async def generate_content_stream(
                 # Initialize Gemini for user
                 initialized = await gemini_service.initialize_for_user(current_user.id)
                 if not initialized:
-                    yield f"data: {json.dumps({'type': 'error', 'data': {'error': 'Gemini service not available'}})}\n\n"
+                    yield _sse({'type': 'error', 'data': {'error': 'Gemini service not available'}})
                     return
             else:
                 # Use system-wide Gemini if no user authentication
                 if not await gemini_service.initialize_for_user("system"):
-                    yield f"data: {json.dumps({'type': 'error', 'data': {'error': 'AI service temporarily unavailable'}})}\n\n"
+                    yield _sse({'type': 'error', 'data': {'error': 'AI service temporarily unavailable'}})
                     return
             
             # Stream content generation
             async for event in gemini_service.generate_content_stream(request):
-                event_data = {
+                yield _sse({
                     "type": event.type,
                     "data": event.data,
-                    "timestamp": event.timestamp.isoformat()
-                }
-                yield f"data: {json.dumps(event_data)}\n\n"
+                    "timestamp": event.timestamp
+                })
             
             # Send completion signal
-            yield "data: [DONE]\n\n"
+            yield b"data: [DONE]\n\n"
             
         except Exception as e:
             logger.error(f"Streaming generation failed: {e}", exc_info=True)
             error_event = {
                 "type": "error",
                 "data": {"error": "Streaming generation failed"},
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": datetime.utcnow()
             }
-            yield f"data: {json.dumps(error_event)}\n\n"
+            yield _sse(error_event)
     
     return StreamingResponse(
         event_generator(),
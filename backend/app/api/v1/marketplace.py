@@ -10,10 +10,12 @@ from fastapi import APIRouter, HTTPException, Query, Depends, BackgroundTasks
 from pydantic import BaseModel, Field
 
 from pathlib import Path
+import orjson
+import yaml
 
 from app.agents.marketplace import (
     MarketplaceService, AgentPackage, AgentTemplate,
-    AgentCategory, AgentSource, AgentBuilder
+    AgentCategory, AgentSource, AgentBuilder, YamlDumper
 )
 from app.agents.engine.registry import get_registry
 from app.agents.engine.base import AgentCapability
@@ -363,12 +365,10 @@ async def export_agent(request: AgentExportRequest):
         )
         
         if request.format == "yaml":
-            import yaml
-            content = yaml.dump(package, default_flow_style=False)
+            content = yaml.dump(package, Dumper=YamlDumper, default_flow_style=False)
             media_type = "application/yaml"
         else:  # json
-            import json
-            content = json.dumps(package, indent=2, default=str)
+            content = orjson.dumps(package, default=str, option=orjson.OPT_INDENT_2).decode()
             media_type = "application/json"
         
         return {
@@ -130,6 +130,7 @@ class Settings(BaseSettings):
     agent_default_timeout: int = Field(default=30, description="Default agent timeout in seconds")
     agent_max_retries: int = Field(default=3, description="Maximum agent retries")
     agent_default_model: str = Field(default="gpt-4", description="Default LLM model")
+    writer_llm_concurrency: int = Field(default=10, description="Maximum concurrent writer LLM calls per process")
     
     @property
     def is_production(self) -> bool:
@@ -3,6 +3,7 @@ Redis state management for WebSocket connections and conversations
 """
 import json
 import asyncio
+import orjson
 from typing import Dict, List, Optional, Any, Set
 from datetime import datetime, timedelta
 import redis.asyncio as redis
@@ -395,6 +396,82 @@ class RedisStateManager:
         except asyncio.CancelledError:
             pass
     
+    # Search Result Cache
+    async def save_search_results(
+        self,
+        cache_key: str,
+        results: List[Dict[str, Any]],
+        ttl: int = 3600
+    ) -> bool:
+        """
+        Cache search results so they are shared across workers and restarts.
+        """
+        if not self.redis:
+            return False
+        try:
+            key = f"search:{cache_key}"
+            await self.redis.setex(
+                key,
+                ttl,
+                orjson.dumps(results)
+            )
+            return True
+        except Exception as e:
+            print(f"Error saving search results: {e}")
+            return False
+    
+    async def get_search_results(self, cache_key: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get cached search results.
+        """
+        if not self.redis:
+            return None
+        try:
+            key = f"search:{cache_key}"
+            data = await self.redis.get(key)
+            return orjson.loads(data) if data else None
+        except Exception as e:
+            print(f"Error getting search results: {e}")
+            return None
+    
+    # Written Content Cache
+    async def save_written_content(
+        self,
+        cache_key: str,
+        content: Dict[str, Any],
+        ttl: int = 3600
+    ) -> bool:
+        """
+        Cache generated writing so identical requests skip the LLM.
+        """
+        if not self.redis:
+            return False
+        try:
+            key = f"writing:{cache_key}"
+            await self.redis.setex(
+                key,
+                ttl,
+                orjson.dumps(content)
+            )
+            return True
+        except Exception as e:
+            print(f"Error saving written content: {e}")
+            return False
+    
+    async def get_written_content(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """
+        Get cached written content.
+        """
+        if not self.redis:
+            return None
+        try:
+            key = f"writing:{cache_key}"
+            data = await self.redis.get(key)
+            return orjson.loads(data) if data else None
+        except Exception as e:
+            print(f"Error getting written content: {e}")
+            return None
+    
     # Metrics and Analytics
     async def increment_metric(
         self,
@@ -0,0 +1,122 @@
+"""
+Semantic cache for agent results keyed by query embeddings.
+
+Looks up the nearest cached query by cosine similarity so paraphrased
+requests can reuse earlier tool output and LLM responses.
+"""
+from typing import Any, List, Optional, Tuple
+import logging
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+logger = logging.getLogger(__name__)
+
+
+class SemanticCache:
+    """
+    Bounded nearest-neighbour cache over normalized query embeddings.
+    
+    Vectors live in a preallocated matrix used as a ring buffer, so a lookup
+    is a single matrix-vector product followed by an argmax.
+    """
+    
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        threshold: float = 0.92,
+        max_entries: int = 1024
+    ):
+        """
+        Initialize the semantic cache.
+        
+        Args:
+            embeddings: Embedding model used to vectorize queries
+            threshold: Minimum cosine similarity for a hit
+            max_entries: Maximum cached entries before the oldest is replaced
+        """
+        self.embeddings = embeddings
+        self.threshold = threshold
+        self.max_entries = max_entries
+        
+        self._vectors: Optional[np.ndarray] = None
+        self._payloads: List[Any] = [None] * max_entries
+        self._size = 0
+        self._next = 0
+    
+    async def embed(self, text: str) -> Optional[np.ndarray]:
+        """
+        Embed and L2-normalize a query.
+        
+        Args:
+            text: Query text
+        
+        Returns:
+            Normalized vector, or None if embedding failed
+        """
+        try:
+            vector = np.asarray(await self.embeddings.aembed_query(text), dtype=np.float32)
+        except Exception as e:
+            logger.warning(f"Semantic cache embedding failed: {e}")
+            return None
+        
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+    
+    def lookup_vector(self, vector: Optional[np.ndarray]) -> Optional[Any]:
+        """
+        Find the cached payload nearest to a normalized vector.
+        
+        Args:
+            vector: Normalized query vector
+        
+        Returns:
+            The payload if the best match clears the threshold, else None
+        """
+        if vector is None or not self._size:
+            return None
+        
+        scores = self._vectors[:self._size] @ vector
+        best = int(np.argmax(scores))
+        if scores[best] >= self.threshold:
+            return self._payloads[best]
+        return None
+    
+    async def lookup(self, text: str) -> Tuple[Optional[Any], Optional[np.ndarray]]:
+        """
+        Embed a query and look up its nearest cached payload.
+        
+        Args:
+            text: Query text
+        
+        Returns:
+            Tuple of (payload or None, query vector for a later ``add``)
+        """
+        vector = await self.embed(text)
+        return self.lookup_vector(vector), vector
+    
+    def add(self, vector: Optional[np.ndarray], payload: Any) -> None:
+        """
+        Cache a payload under a normalized query vector.
+        
+        Args:
+            vector: Normalized query vector from ``embed`` or ``lookup``
+            payload: Value to cache
+        """
+        if vector is None:
+            return
+        
+        if self._vectors is None:
+            self._vectors = np.zeros((self.max_entries, vector.shape[0]), dtype=np.float32)
+        
+        self._vectors[self._next] = vector
+        self._payloads[self._next] = payload
+        self._next = (self._next + 1) % self.max_entries
+        self._size = min(self._size + 1, self.max_entries)
+    
+    def clear(self) -> None:
+        """Drop all cached entries."""
+        self._vectors = None
+        self._payloads = [None] * self.max_entries
+        self._size = 0
+        self._next = 0
@@ -7,7 +7,10 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.responses import JSONResponse
+import copy
 import logging
+import logging.handlers
+import queue
 import sys
 
 from app.config import settings
@@ -22,11 +25,33 @@ from app.api.v1.unified_websocket import unified_router
 from app.api import events
 from app.services.thread_summarization import run_summarization_worker
 
-# Configure logging
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue handler that leaves formatting to the listener thread.
+    
+    The stock QueueHandler formats each record, traceback included, in the
+    logging thread. Here only the message is rendered up front (so it reflects
+    its arguments at call time); tracebacks are formatted off the event loop.
+    """
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+# Configure logging: request code only enqueues records, and a background
+# thread formats and writes them
+_log_handler = logging.StreamHandler(sys.stdout)
+_log_handler.setFormatter(logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s"))
+_log_queue: queue.SimpleQueue = queue.SimpleQueue()
+log_listener = logging.handlers.QueueListener(_log_queue, _log_handler, respect_handler_level=True)
+log_listener.start()
+
 logging.basicConfig(
     level=logging.DEBUG if settings.debug else logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[logging.StreamHandler(sys.stdout)],
+    handlers=[_DeferredQueueHandler(_log_queue)],
 )
 logger = logging.getLogger(__name__)
 
@@ -76,6 +101,9 @@ async def lifespan(app: FastAPI):
         logger.info("Redis connection closed")
     except Exception as e:
         logger.error(f"Error closing Redis connection: {e}")
+    
+    # Flush queued log records
+    log_listener.stop()
 
 
 async def initialize_redis():
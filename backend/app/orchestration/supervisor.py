@@ -212,7 +212,7 @@ class Supervisor:
         logger.info(f"Routing to agent: {agent_id}")
         
         # Get the agent
-        agent = self.registry.get_agent_instance(agent_id)
+        agent = await self.registry.aget_agent_instance(agent_id)
         if not agent:
             logger.error(f"Agent {agent_id} not found")
             state["messages"].append(
@@ -33,7 +33,7 @@ except ImportError:
     BaseMessage = None
 
 try:
-    from app.agents.tools.base_tools import get_base_tools
+    from app.agents.tools.base_tools import get_base_tools, create_session_memory_tool
     BASE_TOOLS_AVAILABLE = True
 except ImportError:
     BASE_TOOLS_AVAILABLE = False
@@ -256,7 +256,11 @@ class GeminiService:
         
         return schemas
     
-    async def _execute_function_call(self, function_call: FunctionCall) -> str:
+    async def _execute_function_call(
+        self,
+        function_call: FunctionCall,
+        session_id: Optional[str] = None
+    ) -> str:
         """Execute a function call and return the result."""
         try:
             if LANGCHAIN_AVAILABLE and BASE_TOOLS_AVAILABLE:
@@ -266,6 +270,10 @@ class GeminiService:
                 
                 tool = self.tools[function_call.name]
                 
+                # Memory persists per conversation rather than in the shared tool
+                if function_call.name == "memory_tool" and session_id:
+                    tool = create_session_memory_tool(session_id)
+                
                 # Execute the tool
                 if asyncio.iscoroutinefunction(tool._run):
                     result = await tool._run(**function_call.args)
@@ -370,7 +378,9 @@ Core Behaviors:
                 )
                 
                 # Execute function call
-                tool_result = await self._execute_function_call(function_call)
+                tool_result = await self._execute_function_call(
+                    function_call, session_id=request.conversation_id
+                )
                 function_calls.append(function_call)
                 tools_used.append(function_call.name)
                 